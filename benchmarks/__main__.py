@@ -0,0 +1,219 @@
+"""
+Benchmarks for the Eskom Loadshedding Interface.
+
+Measures the per-call latency and memory allocated by the schedule calendar's
+async_get_events, the local status sensor's extra_state_attributes and a full
+coordinator update, using synthetic /area and /status responses of several sizes.
+
+Usage (from the repository root, with the requirements installed):
+
+    python -m benchmarks                          # Run and print the results
+    python -m benchmarks --save baseline.json     # Save the results as a baseline
+    python -m benchmarks --compare baseline.json  # Fail on regressions
+"""
+
+import argparse
+import asyncio
+import json
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+from datetime import timedelta
+from types import SimpleNamespace
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+from homeassistant.util.json import json_loads
+
+from custom_components.eskom_loadshedding import EskomDataUpdateCoordinator
+from custom_components.eskom_loadshedding.calendar import (
+    LoadsheddingLocalScheduleCalendar,
+)
+from custom_components.eskom_loadshedding.eskom_interface import EskomInterface
+from custom_components.eskom_loadshedding.hub import EskomHub
+from custom_components.eskom_loadshedding.ledger import QuotaLedger
+from custom_components.eskom_loadshedding.sensor import LoadsheddingAreaInfoSensor
+
+from .fixtures import (
+    SIZES,
+    NullSnapshot,
+    allowance_response,
+    area_response,
+    status_response,
+)
+
+
+class FixtureInterface(EskomInterface):
+    """Interface which decodes canned responses instead of querying the API"""
+
+    def __init__(self, responses: dict[str, str], area_id: str = None):
+        """Initializes class parameters"""
+        super().__init__(session=None, api_key="benchmark", area_id=area_id)
+        self.responses = responses
+
+    async def async_query_api(self, endpoint: str, payload: dict = None):
+        # Decode a fresh copy each time, as a real response would be
+        return json_loads(self.responses[endpoint])
+
+
+async def _measure(func, iterations: int) -> dict:
+    """Measures the latency and memory allocated by an async callable"""
+    # Warm up any caches before measuring
+    await func()
+
+    timings = []
+    for _ in range(iterations):
+        start = time.perf_counter_ns()
+        await func()
+        timings.append(time.perf_counter_ns() - start)
+
+    tracemalloc.start()
+    try:
+        current, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        await func()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+
+    timings.sort()
+    return {
+        "median_us": statistics.median(timings) / 1000,
+        "p95_us": timings[int(len(timings) * 0.95) - 1] / 1000,
+        "peak_kib": (peak - current) / 1024,
+    }
+
+
+async def _run_size(hass: HomeAssistant, size: str, iterations: int) -> dict:
+    """Runs every benchmark against responses of one size"""
+    days, stages, slots = SIZES[size]
+    responses = {
+        "/area": json.dumps(area_response(days, stages, slots)),
+        "/status": json.dumps(status_response()),
+        "/api_allowance": json.dumps(allowance_response()),
+    }
+
+    hub = EskomHub(FixtureInterface(responses), QuotaLedger(hass, "benchmark"))
+    hub.entry_ids.add("benchmark")
+    coordinator = EskomDataUpdateCoordinator(
+        hass,
+        timedelta(hours=2),
+        [FixtureInterface(responses, area_id="benchmark-1")],
+        hub,
+        NullSnapshot(),
+    )
+    area_key = coordinator.area_keys[0]
+
+    async def coordinator_update():
+        # Expire all data so that every endpoint is fetched again, and forget the
+        # parsed data so that the identical responses are parsed again as well
+        hub.last_updates.clear()
+        coordinator.last_updates.clear()
+        coordinator._digests.clear()  # noqa: SLF001
+        coordinator._parsed.clear()  # noqa: SLF001
+        coordinator.data = await coordinator._async_update_data()  # noqa: SLF001
+
+    await coordinator_update()
+
+    config_entry = SimpleNamespace(entry_id="benchmark")
+    calendar = LoadsheddingLocalScheduleCalendar(
+        coordinator,
+        config_entry,
+        area_key=area_key,
+        calendar_id="schedule",
+        friendly_name="Schedule",
+    )
+    sensor = LoadsheddingAreaInfoSensor(
+        coordinator,
+        config_entry,
+        area_key=area_key,
+        sensor_id="local",
+        friendly_name="Local",
+    )
+
+    # Query a week, as the calendar frontend does
+    start_date = dt_util.now()
+    end_date = start_date + timedelta(days=7)
+
+    async def schedule_events():
+        await calendar.async_get_events(hass, start_date, end_date)
+
+    async def area_attributes():
+        sensor.extra_state_attributes  # noqa: B018
+
+    return {
+        f"schedule_events[{size}]": await _measure(schedule_events, iterations),
+        f"area_attributes[{size}]": await _measure(area_attributes, iterations),
+        f"coordinator_update[{size}]": await _measure(
+            coordinator_update, max(iterations // 10, 1)
+        ),
+    }
+
+
+async def _run(sizes: list[str], iterations: int) -> dict:
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        try:
+            results = {}
+            for size in sizes:
+                results.update(await _run_size(hass, size, iterations))
+            return results
+        finally:
+            await hass.async_stop(force=True)
+
+
+def _compare(results: dict, baseline: dict, threshold: float) -> list[str]:
+    """Returns a description of every benchmark slower than the baseline"""
+    regressions = []
+    for name, result in results.items():
+        if name not in baseline:
+            continue
+        ratio = result["median_us"] / baseline[name]["median_us"]
+        if ratio > 1 + threshold:
+            regressions.append(f"{name} is {ratio:.2f}x slower than the baseline")
+    return regressions
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks")
+    parser.add_argument(
+        "--size", action="append", choices=list(SIZES), help="Sizes to run"
+    )
+    parser.add_argument("--iterations", type=int, default=200)
+    parser.add_argument("--save", help="Save the results as a JSON baseline")
+    parser.add_argument("--compare", help="Compare the results to a JSON baseline")
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="Allowed slowdown relative to the baseline before failing",
+    )
+    args = parser.parse_args()
+
+    results = asyncio.run(_run(args.size or list(SIZES), args.iterations))
+
+    print(f"{'benchmark':<32} {'median (us)':>12} {'p95 (us)':>12} {'peak (KiB)':>12}")
+    for name, result in results.items():
+        print(
+            f"{name:<32} {result['median_us']:>12.1f} "
+            f"{result['p95_us']:>12.1f} {result['peak_kib']:>12.1f}"
+        )
+
+    if args.save:
+        with open(args.save, "w", encoding="utf-8") as file:
+            json.dump(results, file, indent=2)
+
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as file:
+            regressions = _compare(results, json.load(file), args.threshold)
+        for regression in regressions:
+            print(regression)
+        return 1 if regressions else 0
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,327 @@
+"""
+Local stand-in for the EskomSePush v2 API.
+
+Serves /status, /area, /areas_search and /api_allowance with configurable latency,
+transient error rate, daily quota (answered with 429 once spent) and stage changes,
+so that the integration can be load tested without spending real API quota.
+
+Usage (from the repository root, with the requirements installed):
+
+    python -m benchmarks.esp_stub --port 8080 --stage-changes 06:00=2,16:00=4
+
+and point BASE_API_URL at http://127.0.0.1:8080/business/2.0.
+"""
+
+import argparse
+import asyncio
+import random
+from collections import Counter
+from datetime import UTC, datetime, time, timedelta
+
+from aiohttp import web
+
+from .fixtures import SAST, SIZES, allowance_response, area_response
+
+API_PATH = "/business/2.0"
+
+# Stages which the national stage cycles through each day by default
+DEFAULT_STAGE_CHANGES = ((time(6), 2), (time(16), 4), (time(22), 0))
+
+
+def parse_stage_changes(value: str) -> tuple[tuple[time, int], ...]:
+    """Parses daily stage changes given as HH:MM=stage,HH:MM=stage"""
+    changes = []
+    for change in value.split(","):
+        change_time, stage = change.split("=")
+        changes.append((time.fromisoformat(change_time), int(stage)))
+    return tuple(sorted(changes))
+
+
+class SimulatedClock:
+    """Clock shared by the stub and the harness, which follows real time if unset"""
+
+    def __init__(self, now: datetime = None):
+        """Initializes class parameters"""
+        self.now = now
+
+    def utcnow(self) -> datetime:
+        """Returns the current (simulated) time"""
+        return self.now or datetime.now(UTC)
+
+
+class StubConfig:
+    """Behaviour of the stub API"""
+
+    def __init__(
+        self,
+        latency: float = 0.05,
+        jitter: float = 0.02,
+        error_rate: float = 0.0,
+        quota: int = 50,
+        stage_changes: tuple[tuple[time, int], ...] = DEFAULT_STAGE_CHANGES,
+        notice: timedelta = timedelta(hours=2),
+        size: str = "default",
+    ):
+        """
+        Initializes class parameters
+
+        Args:
+            latency (float): The mean response latency in seconds
+            jitter (float): The maximum deviation from the mean latency in seconds
+            error_rate (float): The fraction of queries answered with a 503
+            quota (int): The number of billed queries allowed per day per token
+            stage_changes (tuple): Daily (time, stage) changes of the national stage
+            notice (timedelta): How far ahead stage changes are announced
+            size (str): The benchmark size of the area schedules served
+
+        """
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.quota = quota
+        self.stage_changes = stage_changes
+        self.notice = notice
+        self.size = size
+
+
+class EskomStub:
+    """In-memory EskomSePush API, driven by a StubConfig and SimulatedClock"""
+
+    def __init__(self, config: StubConfig, clock: SimulatedClock = None):
+        """Initializes class parameters"""
+        self.config = config
+        self.clock = clock or SimulatedClock()
+        # Responses served per endpoint, and rejected queries per status code
+        self.calls = Counter()
+        self.rejected = Counter()
+        self._quota_used = Counter()
+        self._quota_date = None
+
+    def stage_changes_between(
+        self, start: datetime, end: datetime
+    ) -> list[tuple[datetime, int]]:
+        """Returns the stage changes in (start, end] as (time, stage) pairs"""
+        changes = []
+        day = start.astimezone(SAST).date()
+        while (midnight := datetime.combine(day, time(), SAST)) <= end:
+            for change_time, stage in self.config.stage_changes:
+                when = datetime.combine(day, change_time, SAST)
+                if start < when <= end:
+                    changes.append((when, stage))
+            day = midnight.date() + timedelta(days=1)
+        return changes
+
+    def stage_at(self, when: datetime) -> int:
+        """Returns the national stage in effect at a given time"""
+        # The stage cycles daily, so the latest change within a day of when applies
+        changes = self.stage_changes_between(when - timedelta(days=1), when)
+        return changes[-1][1] if changes else 0
+
+    def status(self) -> dict:
+        """Builds the /status response for the current time"""
+        now = self.clock.utcnow()
+        previous = self.stage_changes_between(now - timedelta(days=1), now)
+        upcoming = self.stage_changes_between(now, now + self.config.notice)
+        eskom = {
+            "name": "National",
+            "next_stages": [
+                {"stage": str(stage), "stage_start_timestamp": when.isoformat()}
+                for when, stage in upcoming
+            ],
+            "stage": str(self.stage_at(now)),
+            "stage_updated": (previous[-1][0] if previous else now).isoformat(),
+        }
+        capetown = {**eskom, "name": "Cape Town"}
+        return {"status": {"capetown": capetown, "eskom": eskom}}
+
+    def area(self, area_id: str) -> dict:
+        """Builds the /area response for the current time"""
+        now = self.clock.utcnow()
+        days, stages, slots = SIZES[self.config.size]
+        response = area_response(
+            days, stages, slots, start=now.astimezone(SAST).date(), event_stage=0
+        )
+        response["info"]["name"] = area_id
+
+        # Events are the schedule slots of the current and announced stages
+        announced = now + self.config.notice
+        events = response["events"]
+        for day in response["schedule"]["days"]:
+            for stage, day_slots in enumerate(day["stages"], start=1):
+                for slot in day_slots:
+                    slot_start, slot_end = (
+                        datetime.combine(
+                            datetime.fromisoformat(day["date"]).date(),
+                            time.fromisoformat(value),
+                            SAST,
+                        )
+                        for value in slot.split("-")
+                    )
+                    if slot_end <= slot_start:
+                        slot_end += timedelta(days=1)
+                    if slot_end <= now:
+                        continue
+                    when = max(slot_start, now)
+                    if when <= announced and self.stage_at(when) == stage:
+                        events.append(
+                            {
+                                "start": slot_start.isoformat(),
+                                "end": slot_end.isoformat(),
+                                "note": f"Stage {stage}",
+                            }
+                        )
+        events.sort(key=lambda event: event["start"])
+        return response
+
+    def areas_search(self, text: str) -> dict:
+        """Builds the /areas_search response"""
+        return {
+            "areas": [
+                {
+                    "id": f"stub-{text}-{index}",
+                    "name": f"{text} {index}",
+                    "region": "Stub Region",
+                }
+                for index in range(1, 4)
+            ]
+        }
+
+    def allowance(self, token: str) -> dict:
+        """Builds the /api_allowance response for a token"""
+        self._reset_quota()
+        return allowance_response(self._quota_used[token], self.config.quota)
+
+    def app(self) -> web.Application:
+        """Creates the web application serving the stub API"""
+        app = web.Application()
+        app.router.add_get(
+            f"{API_PATH}/status", self._endpoint("/status", lambda r: self.status())
+        )
+        app.router.add_get(
+            f"{API_PATH}/area",
+            self._endpoint("/area", lambda r: self.area(r.query["id"])),
+        )
+        app.router.add_get(
+            f"{API_PATH}/areas_search",
+            self._endpoint(
+                "/areas_search", lambda r: self.areas_search(r.query["text"])
+            ),
+        )
+        # Checking the allowance does not count against the quota
+        app.router.add_get(
+            f"{API_PATH}/api_allowance",
+            self._endpoint(
+                "/api_allowance",
+                lambda r: self.allowance(r.headers["Token"]),
+                billed=False,
+            ),
+        )
+        return app
+
+    def _reset_quota(self) -> None:
+        today = self.clock.utcnow().astimezone(SAST).date()
+        if today != self._quota_date:
+            self._quota_date = today
+            self._quota_used.clear()
+
+    def _endpoint(self, endpoint: str, build, billed: bool = True):
+        async def handler(request: web.Request) -> web.Response:
+            config = self.config
+            await asyncio.sleep(
+                max(0.0, random.uniform(-1, 1) * config.jitter + config.latency)
+            )
+
+            token = request.headers.get("Token")
+            if not token:
+                self.rejected[403] += 1
+                return web.json_response({"error": "Invalid token"}, status=403)
+            if random.random() < config.error_rate:
+                self.rejected[503] += 1
+                return web.json_response({"error": "Unavailable"}, status=503)
+            if billed:
+                self._reset_quota()
+                if self._quota_used[token] >= config.quota:
+                    self.rejected[429] += 1
+                    return web.json_response({"error": "Quota exceeded"}, status=429)
+                self._quota_used[token] += 1
+
+            self.calls[endpoint] += 1
+            return web.json_response(build(request))
+
+        return handler
+
+
+async def start_stub(
+    stub: EskomStub, host: str = "127.0.0.1", port: int = 0
+) -> tuple[web.AppRunner, str]:
+    """Starts serving the stub, returning the runner and the base API URL"""
+    runner = web.AppRunner(stub.app())
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    host, port = runner.addresses[0][:2]
+    return runner, f"http://{host}:{port}{API_PATH}"
+
+
+def build_config(args: argparse.Namespace) -> StubConfig:
+    """Builds the stub configuration from parsed command line arguments"""
+    return StubConfig(
+        latency=args.latency,
+        jitter=args.jitter,
+        error_rate=args.error_rate,
+        quota=args.quota,
+        stage_changes=parse_stage_changes(args.stage_changes),
+        notice=timedelta(minutes=args.notice),
+        size=args.size,
+    )
+
+
+def add_arguments(parser: argparse.ArgumentParser) -> None:
+    """Adds the stub configuration arguments to a parser"""
+    parser.add_argument("--latency", type=float, default=0.05, help="Mean latency (s)")
+    parser.add_argument("--jitter", type=float, default=0.02, help="Latency jitter (s)")
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of 503 responses"
+    )
+    parser.add_argument("--quota", type=int, default=50, help="Daily query quota")
+    parser.add_argument(
+        "--stage-changes",
+        default=",".join(
+            f"{change_time:%H:%M}={stage}"
+            for change_time, stage in DEFAULT_STAGE_CHANGES
+        ),
+        help="Daily national stage changes as HH:MM=stage,HH:MM=stage",
+    )
+    parser.add_argument(
+        "--notice",
+        type=int,
+        default=120,
+        help="Minutes in advance that stage changes are announced",
+    )
+    parser.add_argument("--size", choices=list(SIZES), default="default")
+
+
+async def _serve(stub: EskomStub, host: str, port: int) -> None:
+    runner, base_url = await start_stub(stub, host, port)
+    print(f"Serving the EskomSePush stub at {base_url}")
+    try:
+        await asyncio.Event().wait()
+    finally:
+        await runner.cleanup()
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.esp_stub")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8080)
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(_serve(EskomStub(build_config(args)), args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
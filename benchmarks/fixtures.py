@@ -0,0 +1,106 @@
+"""Synthetic EskomSePush API responses for benchmarking."""
+
+from datetime import date, datetime, time, timedelta, timezone
+
+SAST = timezone(timedelta(hours=2))
+
+# Benchmark sizes as (days, stages, slots per stage per day)
+SIZES = {
+    "small": (2, 4, 2),
+    "default": (7, 8, 4),
+    "large": (31, 8, 12),
+}
+
+
+def _slot_times(slot: int, stage: int, slots: int) -> tuple[time, time]:
+    """Returns the start and end time of a schedule slot, spread over the day"""
+    minutes = (slot * 24 * 60 // slots + stage * 30) % (24 * 60)
+    start = datetime.combine(date.min, time()) + timedelta(minutes=minutes)
+    end = start + timedelta(hours=2, minutes=30)
+    return start.time(), end.time()
+
+
+def area_response(
+    days: int, stages: int, slots: int, start: date = None, event_stage: int = 2
+) -> dict:
+    """Builds an /area response with a schedule of the given size"""
+    start = start or datetime.now(SAST).date()
+    schedule_days = []
+    events = []
+    for day in range(days):
+        day_date = start + timedelta(days=day)
+        day_stages = []
+        for stage in range(stages):
+            day_slots = []
+            for slot in range(slots):
+                slot_start, slot_end = _slot_times(slot, stage, slots)
+                day_slots.append(
+                    f"{slot_start.strftime('%H:%M')}-{slot_end.strftime('%H:%M')}"
+                )
+            day_stages.append(day_slots)
+        schedule_days.append(
+            {
+                "date": day_date.isoformat(),
+                "name": day_date.strftime("%A"),
+                "stages": day_stages,
+            }
+        )
+
+        # Add the slots of the event stage as upcoming events
+        for slot in range(slots if event_stage else 0):
+            slot_start, _ = _slot_times(slot, event_stage - 1, slots)
+            event_start = datetime.combine(day_date, slot_start, SAST)
+            events.append(
+                {
+                    "start": event_start.isoformat(),
+                    "end": (event_start + timedelta(hours=2, minutes=30)).isoformat(),
+                    "note": f"Stage {event_stage}",
+                }
+            )
+
+    return {
+        "events": events,
+        "info": {"name": "Benchmark Area", "region": "Benchmark Region"},
+        "schedule": {
+            "days": schedule_days,
+            "source": "https://loadshedding.eskom.co.za/",
+        },
+    }
+
+
+def status_response(stage: int = 2) -> dict:
+    """Builds a /status response"""
+    now = datetime.now(SAST)
+    return {
+        "status": {
+            "capetown": {
+                "name": "Cape Town",
+                "next_stages": [],
+                "stage": "0",
+                "stage_updated": now.isoformat(),
+            },
+            "eskom": {
+                "name": "National",
+                "next_stages": [
+                    {
+                        "stage": str(stage + 1),
+                        "stage_start_timestamp": (now + timedelta(days=1)).isoformat(),
+                    }
+                ],
+                "stage": str(stage),
+                "stage_updated": now.isoformat(),
+            },
+        }
+    }
+
+
+def allowance_response(count: int = 10, limit: int = 50) -> dict:
+    """Builds an /api_allowance response"""
+    return {"allowance": {"count": count, "limit": limit, "type": "daily"}}
+
+
+class NullSnapshot:
+    """Snapshot which discards saves, keeping disk I/O out of measurements"""
+
+    def async_schedule_save(self, results) -> None:
+        """Discards the results"""
@@ -0,0 +1,246 @@
+"""
+End-to-end simulation of the Eskom Loadshedding Interface against the stub API.
+
+Runs N config entries sharing one API key against the local EskomSePush stub for a
+simulated day, refreshing each coordinator whenever its update interval elapses on
+a simulated clock. Reports the API calls spent, the event-loop time used by the
+integration and how long each stage change took to appear in the coordinator data.
+
+Usage (from the repository root, with the requirements installed):
+
+    python -m benchmarks.simulate --entries 5
+    python -m benchmarks.simulate --areas 5 --scan-period 1800
+    python -m benchmarks.simulate --entries 3 --scan-mode adaptive --error-rate 0.1
+"""
+
+import argparse
+import asyncio
+import logging
+import tempfile
+import threading
+import time
+from datetime import datetime, timedelta
+from types import SimpleNamespace
+from unittest import mock
+
+import aiohttp
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from custom_components.eskom_loadshedding import (
+    EskomDataUpdateCoordinator,
+    eskom_interface,
+)
+from custom_components.eskom_loadshedding.const import (
+    DEFAULT_SCAN_MODE,
+    DEFAULT_SCAN_PERIOD,
+    DOMAIN,
+    SCAN_MODES,
+)
+from custom_components.eskom_loadshedding.eskom_interface import EskomInterface
+from custom_components.eskom_loadshedding.hub import async_get_hub
+from custom_components.eskom_loadshedding.session import async_get_coalescer
+
+from .esp_stub import (
+    SAST,
+    EskomStub,
+    SimulatedClock,
+    add_arguments,
+    build_config,
+    start_stub,
+)
+from .fixtures import NullSnapshot
+
+
+class StubServer:
+    """Runs the stub API on its own event loop, keeping it out of the measurements"""
+
+    def __init__(self, stub: EskomStub):
+        """Initializes class parameters"""
+        self.stub = stub
+        self.base_url = None
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._runner = None
+
+    def __enter__(self) -> "StubServer":
+        self._thread.start()
+        self._runner, self.base_url = asyncio.run_coroutine_threadsafe(
+            start_stub(self.stub), self._loop
+        ).result()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        asyncio.run_coroutine_threadsafe(self._runner.cleanup(), self._loop).result()
+        self._loop.call_soon_threadsafe(self._loop.stop)
+        self._thread.join()
+
+
+def _simulated_monotonic(clock: SimulatedClock):
+    """Returns a monotonic clock following the simulated time"""
+    return lambda: clock.utcnow().timestamp()
+
+
+async def _simulate(args: argparse.Namespace, clock: SimulatedClock, stub) -> dict:
+    start = clock.now
+    end = start + timedelta(days=1)
+
+    with tempfile.TemporaryDirectory() as config_dir:
+        hass = HomeAssistant(config_dir)
+        hass.data[DOMAIN] = {}
+        try:
+            async with aiohttp.ClientSession() as session:
+                # Wire up the entries as async_setup_entry does
+                coordinators = []
+                for index in range(args.entries):
+                    entry_id = f"simulated-{index}"
+                    coalescer = async_get_coalescer(hass)
+                    hub = async_get_hub(
+                        hass,
+                        EskomInterface(
+                            session=session, api_key=args.api_key, coalescer=coalescer
+                        ),
+                        entry_id,
+                        area_count=args.areas,
+                    )
+                    clients = [
+                        EskomInterface(
+                            session=session,
+                            api_key=args.api_key,
+                            area_id=f"stub-area-{index}-{area}",
+                            circuit_breaker=hub.client.circuit_breaker,
+                            ledger=hub.ledger,
+                            coalescer=coalescer,
+                        )
+                        for area in range(args.areas)
+                    ]
+                    await hub.ledger.async_load()
+                    coordinators.append(
+                        EskomDataUpdateCoordinator(
+                            hass,
+                            timedelta(seconds=args.scan_period),
+                            clients,
+                            hub,
+                            NullSnapshot(),
+                            scan_mode=args.scan_mode,
+                            local_schedule=args.local_schedule,
+                        )
+                    )
+
+                return await _run_day(coordinators, clock, stub, start, end)
+        finally:
+            await hass.async_stop(force=True)
+
+
+async def _run_day(
+    coordinators: list[EskomDataUpdateCoordinator],
+    clock: SimulatedClock,
+    stub: EskomStub,
+    start: datetime,
+    end: datetime,
+) -> dict:
+    """Refreshes the coordinators as their update intervals elapse until the end"""
+    pending = stub.stage_changes_between(start, end)
+    delays = []
+    due = dict.fromkeys(coordinators, start)
+    refreshes = 0
+    loop_time = 0.0
+
+    while (now := min(due.values())) < end:
+        clock.now = now
+        batch = [coordinator for coordinator, when in due.items() if when == now]
+
+        # Only the integration runs on this thread, so its CPU time is the event-loop
+        # time it used (waiting on the stub does not count)
+        cpu_start = time.thread_time()
+        await asyncio.gather(*(coordinator.async_refresh() for coordinator in batch))
+        loop_time += time.thread_time() - cpu_start
+        refreshes += len(batch)
+
+        for coordinator in batch:
+            due[coordinator] = now + coordinator.update_interval
+
+        # A stage change has appeared once the entries report the new current stage
+        status = (coordinators[0].data or {}).get("status") or {}
+        first = coordinators[0]
+        area_status = status.get(first.status_areas[first.area_keys[0]])
+        while pending and pending[0][0] <= now:
+            changed_at, stage = pending.pop(0)
+            if pending and pending[0][0] <= now:
+                # Superseded by a later change before it was ever seen
+                delays.append((changed_at, stage, None))
+            elif area_status is not None and area_status.stage == stage:
+                delays.append((changed_at, stage, now - changed_at))
+            else:
+                pending.insert(0, (changed_at, stage))
+                break
+
+    delays.extend((changed_at, stage, None) for changed_at, stage in pending)
+    return {"refreshes": refreshes, "loop_time": loop_time, "delays": delays}
+
+
+def _report(args: argparse.Namespace, stub: EskomStub, result: dict) -> None:
+    billed = sum(
+        count for endpoint, count in stub.calls.items() if endpoint != "/api_allowance"
+    )
+    print(
+        f"Simulated a day of {args.entries} entries of {args.areas} areas "
+        f"in {args.scan_mode} mode "
+        f"with a {args.scan_period} s scan period"
+    )
+    print(f"  coordinator refreshes: {result['refreshes']}")
+    print(f"  API calls spent:       {billed} of {args.quota}")
+    for endpoint, count in sorted(stub.calls.items()):
+        print(f"    {endpoint:<20} {count}")
+    for status, count in sorted(stub.rejected.items()):
+        print(f"    rejected with {status}  {count}")
+    print(
+        f"  event-loop time:       {result['loop_time'] * 1000:.1f} ms "
+        f"({result['loop_time'] * 1000 / max(result['refreshes'], 1):.2f} ms/refresh)"
+    )
+    print("  stage change delays:")
+    for changed_at, stage, delay in result["delays"]:
+        shown = (
+            "never seen" if delay is None else f"{delay.total_seconds() / 60:.0f} min"
+        )
+        print(f"    {changed_at.astimezone(SAST):%H:%M} stage {stage:<3} {shown}")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.simulate")
+    parser.add_argument("--entries", type=int, default=1, help="Config entries to run")
+    parser.add_argument("--areas", type=int, default=1, help="Areas per entry")
+    parser.add_argument("--api-key", default="simulated")
+    parser.add_argument(
+        "--scan-period", type=int, default=DEFAULT_SCAN_PERIOD, help="Scan period (s)"
+    )
+    parser.add_argument("--scan-mode", choices=SCAN_MODES, default=DEFAULT_SCAN_MODE)
+    parser.add_argument("--local-schedule", action="store_true")
+    parser.add_argument("--verbose", action="store_true", help="Log API errors")
+    add_arguments(parser)
+    args = parser.parse_args()
+
+    # Injected errors are expected, so only log them on request
+    logging.basicConfig(level=logging.DEBUG if args.verbose else logging.CRITICAL)
+
+    # Start the day at midnight so that it lines up with the daily quota reset
+    today = datetime.now(SAST).replace(hour=0, minute=0, second=0, microsecond=0)
+    clock = SimulatedClock(today.astimezone(dt_util.UTC))
+    stub = EskomStub(build_config(args), clock)
+
+    with (
+        StubServer(stub) as server,
+        mock.patch.multiple(
+            eskom_interface,
+            BASE_API_URL=server.base_url,
+            time=SimpleNamespace(monotonic=_simulated_monotonic(clock)),
+        ),
+        mock.patch.object(dt_util, "utcnow", clock.utcnow),
+    ):
+        result = asyncio.run(_simulate(args, clock, stub))
+
+    _report(args, stub, result)
+
+
+if __name__ == "__main__":
+    main()
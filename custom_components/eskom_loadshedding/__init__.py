@@ -6,31 +6,74 @@ https://github.com/swartjean/ha-eskom-loadshedding
 """
 
 import asyncio
+import importlib
 import logging
-from datetime import timedelta
+from collections import Counter
+from datetime import datetime, timedelta
 
 from homeassistant.config_entries import ConfigEntry
-from homeassistant.core import HomeAssistant
+from homeassistant.core import CALLBACK_TYPE, HomeAssistant, callback
 from homeassistant.core_config import Config
 from homeassistant.exceptions import ConfigEntryNotReady
-from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.helpers import entity_registry as er
 from homeassistant.helpers.update_coordinator import DataUpdateCoordinator, UpdateFailed
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    ADAPTIVE_QUOTA_RESERVE,
     CONF_API_KEY,
+    CONF_AREAS,
+    CONF_LOCAL_SCHEDULE,
+    CONF_MERGE_EVENTS,
+    CONF_SCAN_MODE,
     CONF_SCAN_PERIOD,
+    CONF_SCHEDULE_STAGE,
+    DATA_TTL_OPTIONS,
+    DEFAULT_DATA_TTL,
+    DEFAULT_LOCAL_SCHEDULE,
+    DEFAULT_MERGE_EVENTS,
+    DEFAULT_SCAN_MODE,
     DEFAULT_SCAN_PERIOD,
+    DEFAULT_SCHEDULE_STAGE,
     DOMAIN,
+    LEDGER_RECONCILE_INTERVAL,
+    MANUAL_REFRESH_MIN_INTERVAL,
     PLATFORMS,
+    SCAN_MODE_ADAPTIVE,
+    SCAN_MODE_BOUNDARY,
+    SCHEDULE_HORIZON_MARGIN,
+    SCHEDULE_STAGE_ALL,
+    SCHEDULE_STAGE_CURRENT,
     STARTUP_MESSAGE,
 )
 from .eskom_interface import EskomInterface
+from .hub import SHARED_KEYS, EskomHub, async_get_hub, async_release_hub
+from .models import (
+    PARSERS,
+    Allowance,
+    area_key,
+    data_kind,
+    fingerprint,
+    merge_events,
+)
+from .schedule import derive_events, stage_timeline, status_area_for
+from .scheduler import (
+    adaptive_scan_period,
+    area_budget,
+    boundary_scan_period,
+    expired_keys,
+    round_robin_keys,
+)
+from .services import async_setup_services
+from .session import async_get_coalescer, async_get_session, async_release_session
+from .snapshot import EskomSnapshot
 
 _LOGGER = logging.getLogger(__name__)
 
 
 async def async_setup(hass: HomeAssistant, config: Config):
     """Setting up this integration using YAML is not supported."""
+    async_setup_services(hass)
     return True
 
 
@@ -43,22 +86,81 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     scan_period = timedelta(
         seconds=entry.options.get(CONF_SCAN_PERIOD, DEFAULT_SCAN_PERIOD)
     )
+    scan_mode = entry.options.get(CONF_SCAN_MODE, DEFAULT_SCAN_MODE)
+    data_ttls = {
+        key: timedelta(seconds=entry.options.get(option, DEFAULT_DATA_TTL))
+        for key, option in DATA_TTL_OPTIONS.items()
+    }
+    local_schedule = entry.options.get(CONF_LOCAL_SCHEDULE, DEFAULT_LOCAL_SCHEDULE)
+    merge_events = entry.options.get(CONF_MERGE_EVENTS, DEFAULT_MERGE_EVENTS)
+    schedule_stage = entry.options.get(CONF_SCHEDULE_STAGE, DEFAULT_SCHEDULE_STAGE)
+    platforms = [
+        platform for platform in PLATFORMS if entry.options.get(platform, True)
+    ]
 
-    # Fetch the configured API key and area ID and create the client
+    # Fetch the configured API key and areas and create a client per area. Entries
+    # created before multiple areas were supported only store a single area ID
     api_key = entry.options.get(CONF_API_KEY, entry.data.get("api_key"))
-    area_id = entry.data.get("area_id")
-    session = async_get_clientsession(hass)
-    client = EskomInterface(session=session, api_key=api_key, area_id=area_id)
+    areas = entry.data.get(CONF_AREAS) or [{"id": entry.data.get("area_id")}]
+    session = async_get_session(hass)
+    coalescer = async_get_coalescer(hass)
 
-    coordinator = EskomDataUpdateCoordinator(hass, scan_period, client)
-    await coordinator.async_refresh()
+    # National data is shared between all entries using the same API key
+    hub = async_get_hub(
+        hass,
+        EskomInterface(session=session, api_key=api_key, coalescer=coalescer),
+        entry.entry_id,
+        area_count=len(areas),
+    )
+    clients = [
+        EskomInterface(
+            session=session,
+            api_key=api_key,
+            area_id=area["id"],
+            circuit_breaker=hub.client.circuit_breaker,
+            ledger=hub.ledger,
+            coalescer=coalescer,
+        )
+        for area in areas
+    ]
+    await hub.ledger.async_load()
 
-    if not coordinator.last_update_success:
-        raise ConfigEntryNotReady
+    coordinator = EskomDataUpdateCoordinator(
+        hass,
+        scan_period,
+        clients,
+        hub,
+        EskomSnapshot(hass, entry.entry_id),
+        scan_mode=scan_mode,
+        data_ttls=data_ttls,
+        local_schedule=local_schedule,
+        merge_events=merge_events,
+        schedule_stage=schedule_stage,
+        platforms=platforms,
+        area_names={area["id"]: area.get("name") for area in areas},
+    )
+    coordinator.initial_demand = await _async_registry_demand(hass, entry, coordinator)
+
+    restored = await coordinator.async_restore_snapshot()
+    if not restored:
+        await coordinator.async_refresh()
+
+        if not coordinator.last_update_success:
+            async_release_hub(hass, api_key, entry.entry_id)
+            await async_release_session(hass)
+            raise ConfigEntryNotReady
 
     hass.data[DOMAIN][entry.entry_id] = coordinator
 
-    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    # Only the enabled platforms are set up, so disabled ones are never imported
+    await hass.config_entries.async_forward_entry_setups(entry, coordinator.platforms)
+
+    if restored:
+        # Populate the entities from the snapshot and revalidate in the background,
+        # once the entities have declared the data they use
+        entry.async_create_background_task(
+            hass, coordinator.async_refresh(), f"{DOMAIN} {entry.entry_id} refresh"
+        )
 
     if not entry.update_listeners:
         entry.add_update_listener(async_reload_entry)
@@ -66,23 +168,496 @@ async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     return True
 
 
+async def _async_registry_demand(
+    hass: HomeAssistant, entry: ConfigEntry, coordinator: "EskomDataUpdateCoordinator"
+) -> set[str]:
+    """
+    Returns the data keys used by the entities which are enabled in the registry
+
+    The first refresh happens before any entity has been added, so the entities of
+    the enabled platforms are created up front to find out which data they use.
+    """
+    registry = er.async_get(hass)
+    keys = set()
+    for platform in coordinator.platforms:
+        module = await hass.async_add_import_executor_job(
+            importlib.import_module, f".{platform}", __name__
+        )
+        for entity in module.build_entities(coordinator, entry):
+            entity_id = registry.async_get_entity_id(platform, DOMAIN, entity.unique_id)
+            if entity_id is None:
+                enabled = entity.entity_registry_enabled_default
+            else:
+                enabled = not registry.async_get(entity_id).disabled
+            if enabled:
+                keys.update(entity.demand_keys)
+    return keys
+
+
 class EskomDataUpdateCoordinator(DataUpdateCoordinator):
     """Class to manage fetching data from the API."""
 
-    def __init__(self, hass, scan_period, client: EskomInterface):
+    def __init__(
+        self,
+        hass,
+        scan_period,
+        clients: list[EskomInterface],
+        hub: EskomHub,
+        snapshot: EskomSnapshot,
+        scan_mode: str = DEFAULT_SCAN_MODE,
+        data_ttls: dict[str, timedelta] = None,
+        local_schedule: bool = DEFAULT_LOCAL_SCHEDULE,
+        merge_events: bool = DEFAULT_MERGE_EVENTS,
+        schedule_stage: str = DEFAULT_SCHEDULE_STAGE,
+        platforms: list[str] = None,
+        area_names: dict[str, str] = None,
+    ):
         """Initialize."""
-        self.client = client
-        self.platforms = []
+        # Each area is stored under its own data key, in the configured order
+        self.clients = {area_key(client.area_id): client for client in clients}
+        self.area_names = area_names or {}
+        self.hub = hub
+        self.snapshot = snapshot
+        self.scan_mode = scan_mode
+        self.data_ttls = data_ttls or {}
+        self.local_schedule = local_schedule
+        self.merge_events = merge_events
+        self.schedule_stage = schedule_stage
+        self.status_areas = {
+            key: status_area_for(client.area_id) for key, client in self.clients.items()
+        }
+        self.results = {}
+        self.last_updates = {}
+        self._parsed = {}
+        self._digests = {}
+        self.fingerprints = {}
+        # Stage timeline of the status area when each area's events were last fetched
+        self._area_timelines = {}
+        # Cache, skip and refresh counters, reported by the diagnostics
+        self.counters = Counter()
+        self.platforms = list(PLATFORMS if platforms is None else platforms)
+        # Data keys used by each entity which has been added, and by the entities
+        # enabled in the registry before any have been added
+        self._demands = []
+        self.initial_demand = None
+        # Data kinds requested by the manual refresh in progress
+        self._manual_kinds = ()
+        self._manual_lock = asyncio.Lock()
 
         super().__init__(hass, _LOGGER, name=DOMAIN, update_interval=scan_period)
 
+    @property
+    def area_keys(self) -> tuple[str, ...]:
+        """The data keys of the monitored areas"""
+        return tuple(self.clients)
+
+    @property
+    def required_keys(self) -> set[str]:
+        """
+        The data keys which need to be fetched for the entities in use
+
+        Entities declare their data keys once they are added, so entities that are
+        disabled never cause their endpoints to be fetched. Until then, the keys used
+        by the entities enabled in the registry are fetched, or every key if unknown.
+        """
+        if self._demands:
+            keys = set().union(*self._demands)
+        elif self.initial_demand is not None:
+            keys = set(self.initial_demand)
+        else:
+            keys = {*SHARED_KEYS, *self.clients}
+        if self.scan_mode == SCAN_MODE_ADAPTIVE:
+            # The scan period is derived from the allowance
+            keys.add("allowance")
+        if self.local_schedule and keys.intersection(self.clients):
+            # Area events are derived from the stage
+            keys.add("status")
+        return keys
+
+    @property
+    def allowance(self) -> Allowance | None:
+        """The current API allowance, counted locally since it was last checked"""
+        allowance = self.hub.ledger.allowance(dt_util.utcnow())
+        if allowance is None:
+            return (self.data or {}).get("allowance")
+        return allowance
+
+    @callback
+    def async_add_demand(self, data_keys: tuple[str, ...]) -> CALLBACK_TYPE:
+        """
+        Registers the data keys used by an entity
+
+        Returns:
+            A callback which removes the registration again
+
+        """
+        demand = frozenset(data_keys)
+        self._demands.append(demand)
+        if any((self.data or {}).get(key) is None for key in demand):
+            # Fetch data which was not needed before the entity was added
+            self.hass.async_create_task(self.async_request_refresh())
+
+        @callback
+        def remove_demand() -> None:
+            self._demands.remove(demand)
+
+        return remove_demand
+
+    @property
+    def quota_spent(self) -> int:
+        """The number of requests made for this entry's areas which used quota"""
+        return sum(client.quota_spent for client in self.clients.values())
+
     async def _async_update_data(self):
         """Update data via library."""
+        # Each data key is only fetched once it has outlived both the scan period and
+        # its own TTL, so slow-changing data can be refreshed less often
+        now = dt_util.utcnow()
+        max_ages = {
+            key: max(self.update_interval, self.data_ttls.get(key, timedelta(0)))
+            for key in DATA_TTL_OPTIONS
+        }
+        # The quota ledger keeps count between allowance checks
+        max_ages["allowance"] = max(
+            max_ages["allowance"], timedelta(seconds=LEDGER_RECONCILE_INTERVAL)
+        )
+        for kind in self._manual_kinds:
+            max_ages[kind] = min(
+                max_ages[kind], timedelta(seconds=MANUAL_REFRESH_MIN_INTERVAL)
+            )
+
         try:
-            return await self.client.async_get_data()
+            # Only the area information is specific to this entry. The shared data
+            # is fetched first so that the areas can be fetched within its allowance
+            required_keys = self.required_keys
+            shared_results = await self.hub.async_get_data(
+                max_ages, tuple(key for key in SHARED_KEYS if key in required_keys)
+            )
+            # Parse the fresh status first, as the areas due for a refresh depend on
+            # the current stage timeline
+            self.results = {**self.results, **shared_results}
+            self._normalize_results()
+            area_keys = self._area_keys_to_fetch(now, max_ages, required_keys)
+            area_results = await asyncio.gather(
+                *(self._async_get_area(key) for key in area_keys)
+            )
         except Exception as exception:
             raise UpdateFailed(exception)
 
+        self.counters["refreshes"] += 1
+        self.counters["area_information_fetched"] += len(area_keys)
+        self.counters["area_information_cached"] += len(self.clients) - len(area_keys)
+
+        self.last_updates.update(dict.fromkeys(area_keys, now))
+        area_results = dict(zip(area_keys, area_results, strict=True))
+        self.results = {**self.results, **area_results}
+
+        # Endpoints that failed retain their last good data, so only fail outright
+        # when there is no data at all
+        if required_keys and not any(
+            result.data is not None for result in self.results.values()
+        ):
+            raise UpdateFailed("All API endpoints failed to update")
+
+        self.snapshot.async_schedule_save(self.results)
+
+        data = self._normalize_results()
+        for key, result in area_results.items():
+            if result.success:
+                # Fresh area events reflect the stage timeline they were fetched with
+                self._area_timelines[key] = self._current_timeline(key)
+        data = self._apply_local_schedule(data)
+
+        if self.scan_mode == SCAN_MODE_ADAPTIVE:
+            self._update_adaptive_interval()
+        elif self.scan_mode == SCAN_MODE_BOUNDARY:
+            self._update_boundary_interval(data)
+
+        return data
+
+    def _area_keys_to_fetch(
+        self,
+        now: datetime,
+        max_ages: dict[str, timedelta],
+        required_keys: set[str],
+    ) -> tuple[str, ...]:
+        """
+        Determines which areas to fetch, taking turns when the quota runs low
+
+        Only areas used by an entity are considered. They are due once their data
+        has expired, or, when events are derived from the schedule, once the derived
+        events can no longer be relied upon. If the remaining allowance cannot cover
+        every area on every refresh until the quota resets, the areas fetched least
+        recently go first and the rest wait for a later refresh. Areas without any
+        data yet are fetched while any quota remains, so that none is left waiting.
+        """
+        area_keys = tuple(key for key in self.clients if key in required_keys)
+        if self.local_schedule and "area_information" not in self._manual_kinds:
+            due = tuple(
+                key
+                for key in area_keys
+                if key not in self._area_timelines or self._area_outdated(key, now)
+            )
+        else:
+            area_max_ages = dict.fromkeys(area_keys, max_ages["area_information"])
+            due = expired_keys(area_keys, self.last_updates, area_max_ages, now)
+
+        budget = None
+        allowance = self.allowance
+        if allowance is not None:
+            budget = area_budget(
+                allowance.remaining,
+                self._calls_per_refresh(required_keys),
+                len(area_keys),
+                self.update_interval,
+                now,
+            )
+        keys = round_robin_keys(due, self.last_updates, budget)
+        if budget:
+            keys += tuple(
+                key
+                for key in due
+                if key not in keys
+                and (key not in self.results or self.results[key].data is None)
+            )
+        return keys
+
+    async def async_manual_refresh(self, kinds: tuple[str, ...]) -> None:
+        """
+        Fetches the requested kinds of data again outside of the refresh schedule
+
+        Data fetched within the minimum manual refresh interval is not fetched again,
+        which protects the quota from automations that call the service in a loop.
+        Concurrent calls are serialised, so a call made while another is in flight
+        finds the data fresh and returns without fetching it again.
+
+        Args:
+            kinds (tuple): The kinds of data to refresh, i.e. "allowance", "status"
+                or "area_information"
+
+        """
+        async with self._manual_lock:
+            now = dt_util.utcnow()
+            # Data which no entity uses is not fetched, even when requested
+            required_keys = self.required_keys
+            keys = tuple(
+                key
+                for key in (*SHARED_KEYS, *self.clients)
+                if data_kind(key) in kinds and key in required_keys
+            )
+            last_updates = {**self.hub.last_updates, **self.last_updates}
+            min_interval = timedelta(seconds=MANUAL_REFRESH_MIN_INTERVAL)
+            due = expired_keys(
+                keys, last_updates, dict.fromkeys(keys, min_interval), now
+            )
+            if not due:
+                _LOGGER.debug("Skipping manual refresh of recently fetched %s", keys)
+                self.counters["manual_refreshes_skipped"] += 1
+                return
+
+            self.counters["manual_refreshes"] += 1
+            self._manual_kinds = tuple({data_kind(key) for key in due})
+            try:
+                await self.async_refresh()
+            finally:
+                self._manual_kinds = ()
+
+    async def _async_get_area(self, key: str):
+        """Fetches the information of a single area"""
+        results = await self.clients[key].async_get_data(
+            ("area_information",), previous={"area_information": self.results.get(key)}
+        )
+        return results["area_information"]
+
+    async def async_restore_snapshot(self) -> bool:
+        """
+        Populates the coordinator with the last good data from the snapshot
+
+        Restored data counts as fetched at its original time, so the next refresh
+        only fetches data which has since expired.
+
+        Returns:
+            Whether any data was restored
+
+        """
+        results = await self.snapshot.async_load()
+        if not results:
+            return False
+
+        # Snapshots saved before multiple areas were supported hold a single area
+        if "area_information" in results:
+            results.setdefault(self.area_keys[0], results.pop("area_information"))
+
+        self.hub.restore(results)
+        for key, result in results.items():
+            if key in self.clients:
+                self.results[key] = result
+                self.last_updates[key] = result.last_success
+        self.results = {**self.results, **self.hub.results}
+        self.data = self._normalize_results()
+        for key in self.clients:
+            if self.data.get(key) is not None:
+                # Assume the area was saved along with the status it was fetched with
+                self._area_timelines[key] = self._current_timeline(key)
+        self.data = self._apply_local_schedule(self.data)
+        return True
+
+    def area_schedule_stage(self, key: str) -> int | None:
+        """
+        Returns the stage whose slots the schedule calendar of an area shows
+
+        Returns:
+            The configured planning stage, the current stage (0 if there is no
+            loadshedding), or None to show every stage. The current stage falls back
+            to every stage while the status is unavailable.
+
+        """
+        if self.schedule_stage == SCHEDULE_STAGE_ALL:
+            return None
+        if self.schedule_stage != SCHEDULE_STAGE_CURRENT:
+            return int(self.schedule_stage)
+        status = (self.data or {}).get("status")
+        if not status or self.status_areas[key] not in status:
+            return None
+        return status[self.status_areas[key]].stage or 0
+
+    def _current_timeline(self, key: str) -> tuple | None:
+        """Returns the current stage timeline of the status area of an area"""
+        status = self._parsed.get("status", (None, None))[1]
+        status_area = self.status_areas[key]
+        if not status or status_area not in status:
+            return None
+        return stage_timeline(status[status_area])
+
+    def _area_outdated(self, key: str, now: datetime) -> bool:
+        """Whether locally derived area events can no longer be relied upon"""
+        area_information = self._parsed.get(key, (None, None))[1]
+        if area_information is None or self._current_timeline(
+            key
+        ) != self._area_timelines.get(key):
+            return True
+        horizon = area_information.schedule_index.end
+        return horizon is None or horizon - now < timedelta(
+            seconds=SCHEDULE_HORIZON_MARGIN
+        )
+
+    def _apply_local_schedule(self, data: dict) -> dict:
+        """
+        Replaces the area events with locally derived ones if they are out of date
+
+        Area events are out of date once the stage timeline has changed since they
+        were fetched, for example when /area could not be fetched because the quota
+        is exhausted. The events are then derived from the cached schedule instead.
+        """
+        for key in self.clients:
+            area_information = data.get(key)
+            timeline = self._current_timeline(key)
+            if area_information is None or timeline in (
+                None,
+                self._area_timelines.get(key),
+            ):
+                continue
+
+            _LOGGER.debug(
+                "Deriving %s events locally for stage timeline %s", key, timeline
+            )
+            self.counters["area_events_derived"] += 1
+            events = derive_events(
+                area_information.schedule, timeline, dt_util.utcnow()
+            )
+            if self.merge_events:
+                events = merge_events(events, per_stage=False)
+            data[key] = area_information.with_events(events)
+            self.fingerprints[key] = fingerprint(
+                [self._digests.get(key), repr(timeline)]
+            )
+        return data
+
+    def _normalize_results(self) -> dict:
+        """
+        Parses the raw endpoint data into the models used by the entities
+
+        Parsing only happens when an endpoint returns new data, so the entities never
+        need to parse anything themselves.
+        """
+        data = {}
+        for key, result in self.results.items():
+            raw, parsed = self._parsed.get(key, (None, None))
+            if result.data is not raw:
+                # Identical responses keep their fingerprint and parsed data, which
+                # lets entities skip state writes when nothing they use has changed
+                digest = fingerprint(result.data) if result.data is not None else None
+                if digest == self._digests.get(key):
+                    self.counters["unchanged_responses"] += 1
+                else:
+                    try:
+                        parsed = self._parse(key, result.data) if digest else None
+                        self._digests[key] = digest
+                    except (KeyError, TypeError, ValueError) as exception:
+                        # Keep the previously parsed data if the new data is malformed
+                        _LOGGER.error("Error parsing %s: %s", key, exception)
+                self._parsed[key] = (result.data, parsed)
+            self.fingerprints[key] = self._digests.get(key)
+            data[key] = parsed
+        return data
+
+    def _parse(self, key: str, raw):
+        """Parses the raw data of a data key, merging adjacent area events if enabled"""
+        parsed = PARSERS[data_kind(key)](raw)
+        if self.merge_events and key in self.clients:
+            # Events derived from the merged schedule are merged as well
+            parsed = parsed.merged()
+        return parsed
+
+    def _calls_per_refresh(self, required_keys: set[str] = None) -> int:
+        """The number of billed API calls spent per refresh of the shared data in use"""
+        if required_keys is None:
+            required_keys = self.required_keys
+        return self.hub.calls_per_refresh(
+            tuple(key for key in SHARED_KEYS if key in required_keys)
+        )
+
+    def _update_adaptive_interval(self) -> None:
+        """Paces the next refresh according to the remaining API allowance"""
+        allowance = self.allowance
+        if allowance is None:
+            return
+
+        scan_period = adaptive_scan_period(
+            allowance.remaining, self._calls_per_refresh(), dt_util.utcnow()
+        )
+        _LOGGER.debug("Adaptive scan period set to %s s", scan_period)
+        self.update_interval = timedelta(seconds=scan_period)
+
+    def _update_boundary_interval(self, data: dict) -> None:
+        """Times the next refresh shortly before the next outage or stage change"""
+        now = dt_util.utcnow()
+        outage_starts = []
+        stage_changes = []
+        status = data.get("status") or {}
+        for key in self.area_keys:
+            area_information = data.get(key)
+            if area_information is not None:
+                outage_starts.extend(area_information.outages.starts_after(now))
+            if self.status_areas[key] in status:
+                stage_changes.extend(
+                    start for _, start in status[self.status_areas[key]].next_stages
+                )
+
+        scan_period = boundary_scan_period(outage_starts, stage_changes, now)
+        allowance = self.allowance
+        calls_per_refresh = self._calls_per_refresh()
+        if (
+            allowance is not None
+            and allowance.remaining - ADAPTIVE_QUOTA_RESERVE < calls_per_refresh
+        ):
+            # Wait for the quota to reset once it has run out
+            scan_period = adaptive_scan_period(
+                allowance.remaining, calls_per_refresh, now
+            )
+        _LOGGER.debug("Boundary scan period set to %s s", scan_period)
+        self.update_interval = timedelta(seconds=scan_period)
+
 
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Handle removal of an entry."""
@@ -99,10 +674,17 @@ async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
 
     if unloaded:
         hass.data[DOMAIN].pop(entry.entry_id)
+        async_release_hub(hass, coordinator.hub.client.api_key, entry.entry_id)
+        await async_release_session(hass)
 
     return unloaded
 
 
+async def async_remove_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Remove the persisted data of a removed entry."""
+    await EskomSnapshot(hass, entry.entry_id).async_remove()
+
+
 async def async_reload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Reload config entry."""
     await hass.config_entries.async_reload(entry.entry_id)
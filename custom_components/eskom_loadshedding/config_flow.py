@@ -5,18 +5,32 @@ from collections import OrderedDict
 import voluptuous as vol
 from homeassistant import config_entries
 from homeassistant.core import callback
-from homeassistant.helpers.aiohttp_client import async_create_clientsession
 from homeassistant.helpers.selector import selector
 
 from .const import (  # pylint: disable=unused-import
     CONF_API_KEY,
+    CONF_AREAS,
+    CONF_LOCAL_SCHEDULE,
+    CONF_MERGE_EVENTS,
+    CONF_SCAN_MODE,
     CONF_SCAN_PERIOD,
+    CONF_SCHEDULE_STAGE,
+    DATA_TTL_OPTIONS,
+    DEFAULT_DATA_TTL,
+    DEFAULT_LOCAL_SCHEDULE,
+    DEFAULT_MERGE_EVENTS,
+    DEFAULT_SCAN_MODE,
     DEFAULT_SCAN_PERIOD,
+    DEFAULT_SCHEDULE_STAGE,
     DOMAIN,
     MIN_SCAN_PERIOD,
     PLATFORMS,
+    REQUEST_RESULT_TTL,
+    SCAN_MODES,
+    SCHEDULE_STAGES,
 )
 from .eskom_interface import EskomInterface
+from .session import async_get_coalescer, async_get_session
 
 
 class EskomFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
@@ -28,6 +42,7 @@ class EskomFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
     def __init__(self):
         """Initialize."""
         self._errors = {}
+        self.selected_areas = {}
 
     async def async_step_user(self, user_input=None):
         self._errors = {}
@@ -76,16 +91,29 @@ class EskomFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         return await self._show_area_config_form(user_input)
 
     async def async_step_area_selection(self, user_input=None):
-        """Collect an area selection from the user"""
+        """Collect one or more area selections from the user"""
         self._errors = {}
 
         if user_input is not None:
-            if "area_selection" in user_input:
-                # Create the entry, saving the API key and area ID
+            names = {item["id"]: item["name"] for item in self.area_list}
+            for area_id in user_input.get("area_selection", []):
+                self.selected_areas.setdefault(area_id, names.get(area_id))
+
+            if user_input.get("add_more_areas"):
+                # Areas from further searches are added to those already selected
+                return await self.async_step_area_search()
+
+            if self.selected_areas:
+                # Create the entry, saving the API key and the selected areas. The
+                # first area is also saved as the area ID used by older versions
                 return self.async_create_entry(
                     title="Loadshedding Status",
                     data={
-                        "area_id": user_input["area_selection"],
+                        "area_id": next(iter(self.selected_areas)),
+                        CONF_AREAS: [
+                            {"id": area_id, "name": name}
+                            for area_id, name in self.selected_areas.items()
+                        ],
                     },
                     options={
                         CONF_API_KEY: self.api_key,
@@ -100,9 +128,10 @@ class EskomFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         ]
 
         data_schema = {}
-        data_schema["area_selection"] = selector(
-            {"select": {"options": area_options, "mode": "dropdown"}}
+        data_schema[vol.Optional("area_selection")] = selector(
+            {"select": {"options": area_options, "mode": "dropdown", "multiple": True}}
         )
+        data_schema[vol.Optional("add_more_areas", default=False)] = bool
         return self.async_show_form(
             step_id="area_selection",
             data_schema=vol.Schema(data_schema),
@@ -140,8 +169,13 @@ class EskomFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
         """Validates an EskomSePush API token."""
         # Perform an api allowance check using the provided token
         try:
-            session = async_create_clientsession(self.hass)
-            interface = EskomInterface(session=session, api_key=api_key)
+            session = async_get_session(self.hass)
+            interface = EskomInterface(
+                session=session,
+                api_key=api_key,
+                coalescer=async_get_coalescer(self.hass),
+                result_ttl=REQUEST_RESULT_TTL,
+            )
             data = await interface.async_query_api("/api_allowance")
             if "error" in data:
                 return False
@@ -152,8 +186,12 @@ class EskomFlowHandler(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def search_area(self, area_search: str) -> dict:
         """Performs an area search using the EskomSePush API"""
-        session = async_create_clientsession(self.hass)
-        interface = EskomInterface(session=session, api_key=self.api_key)
+        session = async_get_session(self.hass)
+        interface = EskomInterface(
+            session=session,
+            api_key=self.api_key,
+            coalescer=async_get_coalescer(self.hass),
+        )
         return await interface.async_search_areas(area_search)
 
 
@@ -195,6 +233,39 @@ class EskomOptionsFlowHandler(config_entries.OptionsFlow):
             )
         ] = int
 
+        data_schema[
+            vol.Optional(
+                CONF_SCAN_MODE,
+                default=self.options.get(CONF_SCAN_MODE, DEFAULT_SCAN_MODE),
+            )
+        ] = vol.In(SCAN_MODES)
+
+        for option in DATA_TTL_OPTIONS.values():
+            data_schema[
+                vol.Optional(option, default=self.options.get(option, DEFAULT_DATA_TTL))
+            ] = vol.All(int, vol.Range(min=0))
+
+        data_schema[
+            vol.Optional(
+                CONF_LOCAL_SCHEDULE,
+                default=self.options.get(CONF_LOCAL_SCHEDULE, DEFAULT_LOCAL_SCHEDULE),
+            )
+        ] = bool
+
+        data_schema[
+            vol.Optional(
+                CONF_MERGE_EVENTS,
+                default=self.options.get(CONF_MERGE_EVENTS, DEFAULT_MERGE_EVENTS),
+            )
+        ] = bool
+
+        data_schema[
+            vol.Optional(
+                CONF_SCHEDULE_STAGE,
+                default=self.options.get(CONF_SCHEDULE_STAGE, DEFAULT_SCHEDULE_STAGE),
+            )
+        ] = vol.In(SCHEDULE_STAGES)
+
         data_schema[
             vol.Optional(
                 CONF_API_KEY,
@@ -217,8 +288,13 @@ class EskomOptionsFlowHandler(config_entries.OptionsFlow):
         """Validates an EskomSePush API token."""
         # Perform an api allowance check using the provided token
         try:
-            session = async_create_clientsession(self.hass)
-            interface = EskomInterface(session=session, api_key=api_key)
+            session = async_get_session(self.hass)
+            interface = EskomInterface(
+                session=session,
+                api_key=api_key,
+                coalescer=async_get_coalescer(self.hass),
+                result_ttl=REQUEST_RESULT_TTL,
+            )
             data = await interface.async_query_api("/api_allowance")
 
             if "error" in data:
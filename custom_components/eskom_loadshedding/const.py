@@ -5,6 +5,10 @@ NAME = "Eskom Loadshedding Interface"
 DEVICE_NAME = "Loadshedding"
 DOMAIN = "eskom_loadshedding"
 DOMAIN_DATA = f"{DOMAIN}_data"
+DATA_HUBS = "hubs"
+DATA_SESSION = "session"
+DATA_SESSION_LISTENER = "session_listener"
+DATA_COALESCER = "coalescer"
 VERSION = "1.1.3"
 
 ISSUE_URL = "https://github.com/swartjean/ha-eskom-loadshedding/issues"
@@ -13,6 +17,9 @@ ISSUE_URL = "https://github.com/swartjean/ha-eskom-loadshedding/issues"
 STATUS_SENSOR_ICON = "mdi:lightning-bolt"
 LOCAL_STATUS_SENSOR_ICON = "mdi:home-lightning-bolt"
 QUOTA_SENSOR_ICON = "mdi:cloud-percent"
+API_STATS_SENSOR_ICON = "mdi:chart-box-outline"
+OUTAGE_SENSOR_ICON = "mdi:timer-outline"
+POWERED_WINDOW_SENSOR_ICON = "mdi:power-plug-outline"
 
 # Platforms
 SENSOR = "sensor"
@@ -23,11 +30,78 @@ PLATFORMS = [SENSOR, CALENDAR]
 CONF_ENABLED = "enabled"
 CONF_SCAN_PERIOD = "scan_period"
 CONF_API_KEY = "api_key"
+CONF_SCAN_MODE = "scan_mode"
+CONF_ALLOWANCE_TTL = "allowance_ttl"
+CONF_STATUS_TTL = "status_ttl"
+CONF_AREA_TTL = "area_ttl"
+CONF_LOCAL_SCHEDULE = "local_schedule"
+CONF_MERGE_EVENTS = "merge_events"
+CONF_SCHEDULE_STAGE = "schedule_stage"
+CONF_AREAS = "areas"
+
+# Options which set the maximum age of the data for each coordinator data key
+DATA_TTL_OPTIONS = {
+    "allowance": CONF_ALLOWANCE_TTL,
+    "status": CONF_STATUS_TTL,
+    "area_information": CONF_AREA_TTL,
+}
+
+# Scan modes
+SCAN_MODE_FIXED = "fixed"
+SCAN_MODE_ADAPTIVE = "adaptive"
+SCAN_MODE_BOUNDARY = "boundary"
+SCAN_MODES = [SCAN_MODE_FIXED, SCAN_MODE_ADAPTIVE, SCAN_MODE_BOUNDARY]
+
+# Stages shown by the schedule calendar: every stage, the current stage, or a
+# fixed planning stage
+SCHEDULE_STAGE_ALL = "all"
+SCHEDULE_STAGE_CURRENT = "current"
+MAX_STAGE = 8
+SCHEDULE_STAGES = [
+    SCHEDULE_STAGE_ALL,
+    SCHEDULE_STAGE_CURRENT,
+    *(str(stage) for stage in range(1, MAX_STAGE + 1)),
+]
 
 # Defaults
 DEFAULT_SCAN_PERIOD = 7200
 MIN_SCAN_PERIOD = 1800
-DEFAULT_CALENDAR_SCAN_PERIOD = 30
+MAX_ADAPTIVE_SCAN_PERIOD = 21600
+DEFAULT_SCAN_MODE = SCAN_MODE_FIXED
+REFRESH_MARGIN = 60
+DEFAULT_DATA_TTL = 0
+DEFAULT_LOCAL_SCHEDULE = False
+DEFAULT_MERGE_EVENTS = False
+DEFAULT_SCHEDULE_STAGE = SCHEDULE_STAGE_ALL
+SCHEDULE_HORIZON_MARGIN = 86400
+# Boundary scan mode: refreshes confirm each outage shortly before it starts and each
+# stage change once it has taken effect, with slower polling in between
+BOUNDARY_REFRESH_LEAD = 900
+BOUNDARY_MIN_SCAN_PERIOD = 300
+BOUNDARY_QUIET_SCAN_PERIOD = 10800
+# Window over which upcoming outage minutes are totalled
+OUTAGE_MINUTES_WINDOW = 86400
+
+# Services
+SERVICE_REFRESH = "refresh"
+ATTR_CONFIG_ENTRY_ID = "config_entry_id"
+ATTR_ENDPOINTS = "endpoints"
+# Data younger than this is not fetched again by a manual refresh
+MANUAL_REFRESH_MIN_INTERVAL = 300
+
+# Storage
+SNAPSHOT_STORAGE_VERSION = 1
+SNAPSHOT_SAVE_DELAY = 10
+SNAPSHOT_MAX_AGE = 86400
+LEDGER_STORAGE_VERSION = 1
+LEDGER_SAVE_DELAY = 10
+
+# Quota ledger
+# Minimum time between allowance checks, other than after the quota resets
+LEDGER_RECONCILE_INTERVAL = 21600
+# Window over which the recent call rate is measured
+LEDGER_RATE_WINDOW = 21600
+LEDGER_MAX_CALLS = 500
 
 # Entity Identifiers
 LOCAL_EVENTS_ID = "calendar_local_events"
@@ -37,7 +111,12 @@ CAPE_TOWN_STATUS_ID = "capetown"
 NATIONAL_STATUS_AREA_ID = "eskom"
 CAPE_TOWN_STATUS_AREA_ID = "capetown"
 LOCAL_STATUS_ID = "local"
+LOCAL_NEXT_OUTAGE_ID = "local_minutes_until_outage"
+LOCAL_OUTAGE_MINUTES_ID = "local_outage_minutes"
+LOCAL_POWERED_WINDOW_ID = "local_longest_powered_window"
 QUOTA_ID = "api_quota"
+API_CALLS_ID = "api_calls"
+API_LATENCY_ID = "api_latency"
 
 # Entity Names
 LOCAL_EVENTS_NAME = "Local Events"
@@ -45,11 +124,38 @@ LOCAL_SCHEDULE_NAME = "Local Schedule"
 NATIONAL_SATUS_NAME = "National Status"
 CAPE_TOWN_STATUS_NAME = "Cape Town Status"
 LOCAL_STATUS_NAME = "Local Status"
+LOCAL_NEXT_OUTAGE_NAME = "Local Minutes Until Outage"
+LOCAL_OUTAGE_MINUTES_NAME = "Local Outage Minutes Next 24h"
+LOCAL_POWERED_WINDOW_NAME = "Local Longest Powered Window Today"
 QUOTA_NAME = "API Quota"
+# Names of the entities of additional areas, formatted with the area name
+AREA_EVENTS_NAME = "{area} Events"
+AREA_SCHEDULE_NAME = "{area} Schedule"
+AREA_STATUS_NAME = "{area} Status"
+AREA_NEXT_OUTAGE_NAME = "{area} Minutes Until Outage"
+AREA_OUTAGE_MINUTES_NAME = "{area} Outage Minutes Next 24h"
+AREA_POWERED_WINDOW_NAME = "{area} Longest Powered Window Today"
+API_CALLS_NAME = "API Calls"
+API_LATENCY_NAME = "API Latency"
 
 # API
 BASE_API_URL = "https://developer.sepush.co.za/business/2.0"
 REQUEST_TIMEOUT_S = 10
+REQUEST_ATTEMPTS = 3
+REQUEST_BACKOFF_BASE = 1
+REQUEST_BACKOFF_MAX = 10
+CIRCUIT_FAILURE_THRESHOLD = 3
+CIRCUIT_RESET_TIMEOUT = 600
+QUOTA_RESET_TIME_ZONE = "Africa/Johannesburg"
+ADAPTIVE_QUOTA_RESERVE = 2
+# Endpoints which do not count against the API quota
+UNBILLED_ENDPOINTS = ("/api_allowance",)
+STATS_LATENCY_SAMPLES = 100
+SESSION_LIMIT_PER_HOST = 4
+SESSION_DNS_CACHE_TTL = 300
+SESSION_KEEPALIVE_TIMEOUT = 60
+# Seconds for which a response may be reused by clients created with a result TTL
+REQUEST_RESULT_TTL = 30
 
 STARTUP_MESSAGE = f"""
 -------------------------------------------------------------------
@@ -0,0 +1,85 @@
+"""Diagnostics support for Eskom Loadshedding Interface."""
+
+from homeassistant.components.diagnostics import async_redact_data
+from homeassistant.config_entries import ConfigEntry
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import CONF_API_KEY, DOMAIN
+from .eskom_interface import EskomInterface
+from .models import isoformat
+
+TO_REDACT = {CONF_API_KEY}
+
+
+def _client_diagnostics(client: EskomInterface) -> dict:
+    return {
+        "quota_spent": client.quota_spent,
+        "endpoints": {
+            endpoint: stats.as_dict() for endpoint, stats in client.stats.items()
+        },
+    }
+
+
+async def async_get_config_entry_diagnostics(
+    hass: HomeAssistant, entry: ConfigEntry
+) -> dict:
+    """Return diagnostics for a config entry."""
+    coordinator = hass.data[DOMAIN][entry.entry_id]
+    hub = coordinator.hub
+    allowance = coordinator.allowance
+    now = dt_util.utcnow()
+
+    return {
+        "entry": {
+            "data": async_redact_data(entry.data, TO_REDACT),
+            "options": async_redact_data(entry.options, TO_REDACT),
+        },
+        "coordinator": {
+            "last_update_success": coordinator.last_update_success,
+            "update_interval": coordinator.update_interval.total_seconds(),
+            "scan_mode": coordinator.scan_mode,
+            "local_schedule": coordinator.local_schedule,
+            "merge_events": coordinator.merge_events,
+            "schedule_stage": coordinator.schedule_stage,
+            "last_updates": {
+                key: isoformat(value) for key, value in coordinator.last_updates.items()
+            },
+            "errors": {
+                key: result.error
+                for key, result in coordinator.results.items()
+                if result.error is not None
+            },
+            "counters": dict(coordinator.counters),
+            "snapshot_saved_at": isoformat(
+                getattr(coordinator.snapshot, "saved_at", None)
+            ),
+        },
+        # Requests specific to this entry, i.e. the information of each area
+        "areas": {
+            client.area_id: _client_diagnostics(client)
+            for client in coordinator.clients.values()
+        },
+        # Requests shared between every entry using the same API key
+        "hub": {
+            "entries": len(hub.entry_ids),
+            "last_updates": {
+                key: isoformat(value) for key, value in hub.last_updates.items()
+            },
+            "counters": dict(hub.counters),
+            **_client_diagnostics(hub.client),
+        },
+        "circuit": {
+            "state": hub.client.circuit_breaker.state,
+            "failures": hub.client.circuit_breaker.failures,
+        },
+        "quota": {
+            "count": allowance.count if allowance else None,
+            "limit": allowance.limit if allowance else None,
+            "spent_by_entry": coordinator.quota_spent,
+            "spent_by_hub": hub.client.quota_spent,
+            "ledger_reconciled_at": isoformat(hub.ledger.reconciled_at),
+            "ledger_reconcile_due": hub.ledger.reconcile_due(now),
+            "projected_exhaustion": isoformat(hub.ledger.projected_exhaustion(now)),
+        },
+    }
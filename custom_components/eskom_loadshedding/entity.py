@@ -1,14 +1,23 @@
 """EskomEntity class"""
 
+from datetime import datetime
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_point_in_utc_time
 from homeassistant.helpers.update_coordinator import CoordinatorEntity
 
 from .const import DEVICE_NAME, DOMAIN, VERSION
 
 
 class EskomEntity(CoordinatorEntity):
+    # Coordinator data keys that the entity state is derived from
+    data_keys: tuple[str, ...] = ()
+
     def __init__(self, coordinator, config_entry):
         super().__init__(coordinator)
         self.config_entry = config_entry
+        self._unsub_state_change = None
+        self._fingerprints = None
 
     @property
     def device_info(self):
@@ -18,3 +27,92 @@ class EskomEntity(CoordinatorEntity):
             "model": VERSION,
             "manufacturer": "swartjean",
         }
+
+    @property
+    def demand_keys(self) -> tuple[str, ...]:
+        """The coordinator data keys which need to be fetched for this entity"""
+        return self.data_keys
+
+    @property
+    def available(self):
+        # Endpoints are fetched independently, so only depend on the relevant data
+        return super().available and all(
+            self.coordinator.data.get(key) is not None for key in self.data_keys
+        )
+
+    def next_state_change(self) -> datetime | None:
+        """
+        Returns the next time at which the entity state changes without new data
+
+        Entities whose state depends on the current time override this so that their
+        state is written at the exact moment it changes, rather than being polled.
+        """
+        return None
+
+    async def async_added_to_hass(self) -> None:
+        await super().async_added_to_hass()
+        self._fingerprints = self._current_fingerprints()
+        self._schedule_state_change()
+        self.async_on_remove(self._cancel_state_change)
+        # Only the data used by entities which have been added is fetched
+        self.async_on_remove(self.coordinator.async_add_demand(self.demand_keys))
+
+    def _current_fingerprints(self) -> tuple:
+        return (
+            self.coordinator.last_update_success,
+            *(self.coordinator.fingerprints.get(key) for key in self.data_keys),
+        )
+
+    @callback
+    def _handle_coordinator_update(self) -> None:
+        """Handle updated data from the coordinator."""
+        # Skip the state write if none of the data this entity uses has changed
+        fingerprints = self._current_fingerprints()
+        if fingerprints == self._fingerprints:
+            self.coordinator.counters["state_writes_skipped"] += 1
+            return
+        self._fingerprints = fingerprints
+
+        # New data may move the next state change, so reschedule it
+        self._schedule_state_change()
+        super()._handle_coordinator_update()
+
+    @callback
+    def _schedule_state_change(self) -> None:
+        self._cancel_state_change()
+        if not self.available:
+            return
+        point_in_time = self.next_state_change()
+        if point_in_time is not None:
+            self._unsub_state_change = async_track_point_in_utc_time(
+                self.hass, self._handle_state_change, point_in_time
+            )
+
+    @callback
+    def _cancel_state_change(self) -> None:
+        if self._unsub_state_change is not None:
+            self._unsub_state_change()
+            self._unsub_state_change = None
+
+    @callback
+    def _handle_state_change(self, now: datetime) -> None:
+        self._unsub_state_change = None
+        self.async_write_ha_state()
+        self._schedule_state_change()
+
+
+def area_entity_naming(
+    coordinator, key: str, entity_id: str, name: str, area_name: str
+) -> tuple[str, str]:
+    """
+    Returns the ID and friendly name of an entity belonging to an area
+
+    The first area keeps the IDs and names used before multiple areas were supported,
+    so that existing entities are preserved. The entities of further areas include
+    the area in their ID and name.
+    """
+    if key == coordinator.area_keys[0]:
+        return entity_id, name
+    area_id = coordinator.clients[key].area_id
+    area = coordinator.area_names.get(area_id) or area_id
+    return f"{entity_id}_{area_id}", area_name.format(area=area)
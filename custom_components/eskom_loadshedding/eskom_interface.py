@@ -1,24 +1,285 @@
+import asyncio
 import logging
+import math
+import random
 import socket
+import time
+from collections import Counter, deque
+from collections.abc import Awaitable, Callable
+from datetime import UTC, datetime
+from functools import partial
+from typing import TYPE_CHECKING
 
 import aiohttp
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.util.json import json_loads
 
-from .const import BASE_API_URL, REQUEST_TIMEOUT_S  # pylint: disable=unused-import
+from .const import (  # pylint: disable=unused-import
+    BASE_API_URL,
+    CIRCUIT_FAILURE_THRESHOLD,
+    CIRCUIT_RESET_TIMEOUT,
+    REQUEST_ATTEMPTS,
+    REQUEST_BACKOFF_BASE,
+    REQUEST_BACKOFF_MAX,
+    REQUEST_TIMEOUT_S,
+    STATS_LATENCY_SAMPLES,
+    UNBILLED_ENDPOINTS,
+)
+from .models import PROJECTIONS, isoformat
+
+if TYPE_CHECKING:
+    from .ledger import QuotaLedger
 
 _LOGGER: logging.Logger = logging.getLogger(__package__)
 
 
+class EndpointResult:
+    """Outcome of the most recent query of a single API endpoint"""
+
+    __slots__ = ("data", "error", "last_success")
+
+    def __init__(self, data=None, error: str = None, last_success: datetime = None):
+        """Initializes class parameters"""
+        self.data = data
+        self.error = error
+        self.last_success = last_success
+
+    @property
+    def success(self) -> bool:
+        """Whether the most recent query succeeded"""
+        return self.error is None
+
+
+class CircuitBreaker:
+    """
+    Stops querying the API after repeated transient failures
+
+    After CIRCUIT_FAILURE_THRESHOLD consecutive failed queries the circuit opens and
+    queries are skipped. Once CIRCUIT_RESET_TIMEOUT has passed a single trial query
+    is allowed through (half-open), which either closes the circuit again or re-opens
+    it for another timeout.
+    """
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(
+        self,
+        failure_threshold: int = CIRCUIT_FAILURE_THRESHOLD,
+        reset_timeout: float = CIRCUIT_RESET_TIMEOUT,
+    ):
+        """Initializes class parameters"""
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+
+    @property
+    def state(self) -> str:
+        """The current state of the circuit"""
+        if self.opened_at is None:
+            return self.CLOSED
+        if time.monotonic() - self.opened_at >= self.reset_timeout:
+            return self.HALF_OPEN
+        return self.OPEN
+
+    def allow_request(self) -> bool:
+        """Whether a query may be made"""
+        state = self.state
+        if state == self.CLOSED:
+            return True
+        if state == self.HALF_OPEN and not self._trial_in_progress:
+            self._trial_in_progress = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        """Closes the circuit after a successful query"""
+        self.failures = 0
+        self.opened_at = None
+        self._trial_in_progress = False
+
+    def record_failure(self) -> None:
+        """Counts a failed query, opening the circuit once the threshold is reached"""
+        self.failures += 1
+        self._trial_in_progress = False
+        if self.failures >= self.failure_threshold or self.opened_at is not None:
+            if self.opened_at is None:
+                _LOGGER.warning(
+                    "Opening API circuit after %s consecutive failures", self.failures
+                )
+            self.opened_at = time.monotonic()
+
+
+class EndpointStats:
+    """Request statistics of a single API endpoint"""
+
+    def __init__(self, billed: bool = True):
+        """Initializes class parameters"""
+        self.billed = billed
+        self.requests = 0
+        self.successes = 0
+        self.skipped = 0
+        self.coalesced = 0
+        self.bytes = 0
+        self.errors = Counter()
+        # Latencies of the most recent requests, in seconds
+        self.latencies = deque(maxlen=STATS_LATENCY_SAMPLES)
+        self.last_success = None
+
+    @property
+    def quota_spent(self) -> int:
+        """The number of requests which counted against the API quota"""
+        return self.successes if self.billed else 0
+
+    def record_response(self, status: int, latency: float, size: int) -> None:
+        """Records a request which received a response"""
+        self.requests += 1
+        self.latencies.append(latency)
+        self.bytes += size
+        if status < 400:
+            self.successes += 1
+            self.last_success = datetime.now(UTC)
+        else:
+            self.errors[f"HTTP {status}"] += 1
+
+    def record_error(self, error: str, latency: float = None) -> None:
+        """Records a request which failed, or a response which could not be parsed"""
+        if latency is not None:
+            self.requests += 1
+            self.latencies.append(latency)
+        self.errors[error] += 1
+
+    def latency_percentile(self, percentile: float) -> float | None:
+        """Returns a percentile of the recent request latencies in milliseconds"""
+        if not self.latencies:
+            return None
+        latencies = sorted(self.latencies)
+        index = max(math.ceil(percentile / 100 * len(latencies)) - 1, 0)
+        return round(latencies[index] * 1000, 1)
+
+    def as_dict(self) -> dict:
+        """Returns the statistics as a JSON serialisable dict"""
+        return {
+            "requests": self.requests,
+            "successes": self.successes,
+            "quota_spent": self.quota_spent,
+            "skipped": self.skipped,
+            "coalesced": self.coalesced,
+            "bytes": self.bytes,
+            "errors": dict(self.errors),
+            "latency_ms": {
+                "p50": self.latency_percentile(50),
+                "p95": self.latency_percentile(95),
+                "max": self.latency_percentile(100),
+            },
+            "last_success": isoformat(self.last_success),
+        }
+
+
+class RequestCoalescer:
+    """
+    Shares identical API requests between clients
+
+    Concurrent identical requests share a single query and its outcome, and clients
+    with a result TTL also reuse a sufficiently recent response. Requests are
+    identified by token, URL and parameters, so the clients need not be the same.
+    """
+
+    def __init__(self, hass: HomeAssistant):
+        """Initializes class parameters"""
+        self.hass = hass
+        self.in_flight: dict[tuple, asyncio.Task] = {}
+        # Recent responses, with the monotonic times they were received and expire
+        self.recent: dict[tuple, tuple[float, float, dict]] = {}
+
+    async def async_request(
+        self,
+        key: tuple,
+        query: Callable[[], Awaitable],
+        stats: "EndpointStats",
+        result_ttl: float = 0,
+    ):
+        """
+        Returns the outcome of a request, sharing it with identical requests
+
+        Args:
+            key (tuple): The token, URL and parameters of the request
+            query (callable): Starts the query when no identical request is shared
+            stats (EndpointStats): The statistics of the requested endpoint
+            result_ttl (float): Seconds for which a recent response may be reused
+
+        Returns:
+            The response data of the query
+
+        """
+        now = time.monotonic()
+        self._purge_recent(now)
+        recent = self.recent.get(key)
+        if recent is not None and now - recent[0] < result_ttl:
+            stats.coalesced += 1
+            return recent[2]
+
+        task = self.in_flight.get(key)
+        if task is None:
+            task = self.hass.async_create_task(query(), f"eskom_loadshedding {key[1]}")
+            self.in_flight[key] = task
+            task.add_done_callback(partial(self._async_query_done, key))
+        else:
+            stats.coalesced += 1
+
+        # Shielded so that a cancelled caller does not cancel the query of the others
+        data = await asyncio.shield(task)
+        if data is not None and result_ttl > 0:
+            now = time.monotonic()
+            self._purge_recent(now)
+            self.recent[key] = (now, now + result_ttl, data)
+        return data
+
+    @callback
+    def _async_query_done(self, key: tuple, task: asyncio.Task) -> None:
+        if self.in_flight.get(key) is task:
+            del self.in_flight[key]
+        # Retrieve the outcome in case every caller was cancelled before it finished.
+        # The callers which are still waiting receive it regardless
+        if not task.cancelled() and (exception := task.exception()) is not None:
+            _LOGGER.debug("Query of %s failed: %s", key[1], exception)
+
+    def _purge_recent(self, now: float) -> None:
+        """Drops the recent responses which have expired"""
+        expired = [key for key, recent in self.recent.items() if recent[1] <= now]
+        for key in expired:
+            del self.recent[key]
+
+
 class EskomInterface:
     """Interface class to obtain loadshedding information using the EskomSePush API"""
 
     def __init__(
-        self, session: aiohttp.ClientSession, api_key: str, area_id: str = None
+        self,
+        session: aiohttp.ClientSession,
+        api_key: str,
+        area_id: str = None,
+        circuit_breaker: "CircuitBreaker" = None,
+        ledger: "QuotaLedger" = None,
+        coalescer: RequestCoalescer = None,
+        result_ttl: float = 0,
     ):
         """Initializes class parameters"""
         self.session = session
         self.api_key = api_key
         self.area_id = area_id
+        self.circuit_breaker = circuit_breaker or CircuitBreaker()
+        # Quota ledger shared by every client using the API key, if any
+        self.ledger = ledger
+        # Shares identical requests with other clients, if any
+        self.coalescer = coalescer
+        # Seconds for which a recent identical response is reused instead of queried
+        self.result_ttl = result_ttl
         self.base_url = BASE_API_URL
+        self.stats = {}
         self.headers = {
             "Token": api_key,
         }
@@ -35,42 +296,121 @@ class EskomInterface:
             The response object from the request
 
         """
+        if self.coalescer is None:
+            return await self._async_query_api(endpoint, payload)
+
+        key = (
+            self.api_key,
+            self.base_url + endpoint,
+            tuple(sorted((payload or {}).items())),
+        )
+        return await self.coalescer.async_request(
+            key,
+            partial(self._async_query_api, endpoint, payload),
+            self.endpoint_stats(endpoint),
+            self.result_ttl,
+        )
+
+    async def _async_query_api(self, endpoint: str, payload: dict = None):
+        """Queries an endpoint, retrying transient errors"""
         query_url = self.base_url + endpoint
-        try:
-            async with self.session.get(
-                url=query_url,
-                headers=self.headers,
-                params=payload,
-                timeout=REQUEST_TIMEOUT_S,
-            ) as resp:
-                return await resp.json()
-        except aiohttp.ClientResponseError as exception:
-            _LOGGER.error(
-                "Error fetching information from %s. Response code: %s",
-                query_url,
-                exception.status,
-            )
-            # Re-raise the ClientResponseError to allow checking for valid headers during config
-            # These will be caught by the DataUpdateCoordinator
-            raise
-        except TimeoutError as exception:
-            _LOGGER.error(
-                "Timeout fetching information from %s: %s",
-                query_url,
-                exception,
-            )
-        except (KeyError, TypeError) as exception:
-            _LOGGER.error(
-                "Error parsing information from %s: %s",
-                query_url,
-                exception,
+        stats = self.endpoint_stats(endpoint)
+
+        # Avoid hammering the API while it appears to be down
+        if not self.circuit_breaker.allow_request():
+            _LOGGER.warning(
+                "Skipping query of %s while the API circuit is open", query_url
             )
-        except (aiohttp.ClientError, socket.gaierror) as exception:
-            _LOGGER.error(
-                "Error fetching information from %s: %s",
-                query_url,
-                exception,
+            stats.skipped += 1
+            return None
+
+        for attempt in range(REQUEST_ATTEMPTS):
+            if attempt:
+                # Back off exponentially, with full jitter to spread out retries
+                delay = min(
+                    REQUEST_BACKOFF_MAX, REQUEST_BACKOFF_BASE * 2 ** (attempt - 1)
+                )
+                await asyncio.sleep(random.uniform(0, delay))
+
+            started = time.monotonic()
+            try:
+                async with self.session.get(
+                    url=query_url,
+                    headers=self.headers,
+                    params=payload,
+                    timeout=REQUEST_TIMEOUT_S,
+                ) as resp:
+                    body = await resp.read()
+                    stats.record_response(
+                        resp.status, time.monotonic() - started, len(body)
+                    )
+                    if self.ledger is not None and stats.billed and resp.status < 400:
+                        self.ledger.record_call()
+                    if resp.status < 500:
+                        # Client errors (including an exhausted quota) are returned
+                        # without retrying as they will not resolve themselves
+                        data = json_loads(body)
+                        self.circuit_breaker.record_success()
+                        return data
+                    _LOGGER.error(
+                        "Error fetching information from %s. Response code: %s",
+                        query_url,
+                        resp.status,
+                    )
+            except aiohttp.ClientResponseError as exception:
+                stats.record_error(type(exception).__name__)
+                _LOGGER.error(
+                    "Error fetching information from %s. Response code: %s",
+                    query_url,
+                    exception.status,
+                )
+                # The API did respond, so this does not count against the circuit
+                self.circuit_breaker.record_success()
+                # Re-raise the ClientResponseError to allow checking for valid headers during config
+                # These will be caught by the DataUpdateCoordinator
+                raise
+            except TimeoutError as exception:
+                stats.record_error("TimeoutError", time.monotonic() - started)
+                _LOGGER.error(
+                    "Timeout fetching information from %s: %s",
+                    query_url,
+                    exception,
+                )
+            except (KeyError, TypeError, ValueError) as exception:
+                # Includes bodies which could not be decoded as JSON
+                stats.record_error(type(exception).__name__)
+                _LOGGER.error(
+                    "Error parsing information from %s: %s",
+                    query_url,
+                    exception,
+                )
+                self.circuit_breaker.record_success()
+                return None
+            except (aiohttp.ClientError, socket.gaierror) as exception:
+                stats.record_error(type(exception).__name__, time.monotonic() - started)
+                _LOGGER.error(
+                    "Error fetching information from %s: %s",
+                    query_url,
+                    exception,
+                )
+
+        # Every attempt failed with a transient error
+        self.circuit_breaker.record_failure()
+        return None
+
+    def endpoint_stats(self, endpoint: str) -> EndpointStats:
+        """Returns the request statistics of an endpoint, creating them if required"""
+        stats = self.stats.get(endpoint)
+        if stats is None:
+            stats = self.stats[endpoint] = EndpointStats(
+                billed=endpoint not in UNBILLED_ENDPOINTS
             )
+        return stats
+
+    @property
+    def quota_spent(self) -> int:
+        """The number of requests made by this client which counted against the quota"""
+        return sum(stats.quota_spent for stats in self.stats.values())
 
     async def async_get_status(self) -> dict:
         """Fetches the current loadshedding status"""
@@ -94,15 +434,61 @@ class EskomInterface:
         payload = {"text": area_search}
         return await self.async_query_api("/areas_search", payload=payload)
 
-    async def async_get_data(self):
-        """Fetches all relevant data from the loadshedding API"""
-        allowance = await self.async_get_allowance()
-        status = await self.async_get_status()
-        area_information = await self.async_get_area_information()
+    async def async_get_data(
+        self,
+        keys: tuple[str, ...] = ("allowance", "status", "area_information"),
+        previous: dict[str, EndpointResult] = None,
+    ) -> dict[str, EndpointResult]:
+        """
+        Concurrently fetches data from the loadshedding API
+
+        Args:
+            keys (tuple, optional): The data keys to fetch. Defaults to all endpoints.
+            previous (dict, optional): The results of the previous fetch, used to
+                retain the last good data of any endpoint that fails.
 
-        data = {
-            "allowance": allowance,
-            "status": status,
-            "area_information": area_information,
+        Returns:
+            A dict mapping each key to an EndpointResult
+
+        """
+        fetchers = {
+            "allowance": self.async_get_allowance,
+            "status": self.async_get_status,
+            "area_information": self.async_get_area_information,
         }
-        return data
+        responses = await asyncio.gather(
+            *(fetchers[key]() for key in keys), return_exceptions=True
+        )
+
+        previous = previous or {}
+        return {
+            key: self._build_result(key, response, previous.get(key))
+            for key, response in zip(keys, responses, strict=True)
+        }
+
+    @staticmethod
+    def _build_result(
+        key: str, response, last: EndpointResult = None
+    ) -> EndpointResult:
+        """Creates an endpoint result, falling back to the last good data on failure"""
+        if isinstance(response, BaseException):
+            error = repr(response)
+        elif response is None:
+            error = "No response"
+        elif "error" in response:
+            error = str(response["error"])
+        else:
+            try:
+                # Only keep the fields that are used, before the response is stored
+                data = PROJECTIONS[key](response)
+            except (KeyError, TypeError, AttributeError) as exception:
+                error = f"Malformed response: {exception!r}"
+            else:
+                return EndpointResult(data=data, last_success=datetime.now(UTC))
+
+        _LOGGER.warning("Failed to update %s: %s", key, error)
+        if last is None:
+            return EndpointResult(error=error)
+        return EndpointResult(
+            data=last.data, error=error, last_success=last.last_success
+        )
@@ -0,0 +1,136 @@
+"""Shared API data hub for the Eskom Loadshedding Interface."""
+
+import asyncio
+import logging
+from collections import Counter
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant
+from homeassistant.util import dt as dt_util
+
+from .const import DATA_HUBS, DOMAIN
+from .eskom_interface import EndpointResult, EskomInterface
+from .ledger import QuotaLedger
+from .models import parse_allowance
+from .scheduler import expired_keys
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+# Data keys which are independent of the configured area
+SHARED_KEYS = ("allowance", "status")
+# Data keys whose endpoints do not count towards the API quota
+UNBILLED_KEYS = ("allowance",)
+
+
+class EskomHub:
+    """
+    Fetches the national endpoints once for all config entries sharing an API key
+
+    The /status and /api_allowance responses do not depend on the configured area,
+    so a single copy is kept per API key and handed to every coordinator using it.
+    """
+
+    def __init__(self, client: EskomInterface, ledger: QuotaLedger):
+        """Initializes class parameters"""
+        self.client = client
+        self.ledger = ledger
+        client.ledger = ledger
+        self.entry_ids = set()
+        # Number of areas monitored by each entry using the hub
+        self.area_counts = {}
+        self.results = {}
+        self.last_updates = {}
+        # Number of times each data key was fetched or served from the cache
+        self.counters = Counter()
+        self._lock = asyncio.Lock()
+
+    async def async_get_data(
+        self, max_ages: dict[str, timedelta], keys: tuple[str, ...] = SHARED_KEYS
+    ) -> dict[str, EndpointResult]:
+        """
+        Returns the shared national data, refreshing any that has expired
+
+        Args:
+            max_ages (dict): The maximum age of cached data the caller will accept
+                for each data key
+            keys (tuple): The data keys the caller needs, of which only the expired
+                ones are fetched
+
+        Returns:
+            A dict containing the "allowance" and "status" endpoint results
+
+        """
+        # Serialise refreshes so that coordinators updating together share one fetch
+        async with self._lock:
+            now = dt_util.utcnow()
+            expired = expired_keys(keys, self.last_updates, max_ages, now)
+            if (
+                "allowance" in keys
+                and "allowance" not in expired
+                and self.ledger.reconcile_due(now)
+            ):
+                # The ledger count restarts when the quota resets, so check it
+                expired = (*expired, "allowance")
+            for key in keys:
+                fetched = key in expired
+                self.counters[f"{key}_{'fetched' if fetched else 'cached'}"] += 1
+            if expired:
+                _LOGGER.debug("Refreshing shared %s for %s", expired, self.entry_ids)
+                results = await self.client.async_get_data(
+                    expired, previous=self.results
+                )
+                self.results = {**self.results, **results}
+                self.last_updates.update(dict.fromkeys(expired, now))
+                allowance = results.get("allowance")
+                if allowance is not None and allowance.success:
+                    self._reconcile(allowance)
+            return self.results
+
+    def _reconcile(self, allowance: EndpointResult) -> None:
+        try:
+            self.ledger.reconcile(parse_allowance(allowance.data))
+        except (KeyError, TypeError, ValueError) as exception:
+            _LOGGER.error("Error parsing allowance: %s", exception)
+
+    def restore(self, results: dict[str, EndpointResult]) -> None:
+        """Seeds the hub with restored results for any data it does not yet have"""
+        for key in SHARED_KEYS:
+            if key in results and key not in self.results:
+                self.results[key] = results[key]
+                self.last_updates[key] = results[key].last_success
+
+    def calls_per_refresh(self, keys: tuple[str, ...] = SHARED_KEYS) -> int:
+        """
+        Returns the number of billed API calls spent when every entry refreshes
+
+        Args:
+            keys (tuple): The shared data keys which are fetched
+
+        """
+        billed = sum(1 for key in keys if key not in UNBILLED_KEYS)
+        return billed + sum(self.area_counts.values())
+
+
+def async_get_hub(
+    hass: HomeAssistant, client: EskomInterface, entry_id: str, area_count: int = 1
+):
+    """Returns the hub for the client's API key, creating it if required"""
+    hubs = hass.data[DOMAIN].setdefault(DATA_HUBS, {})
+    hub = hubs.get(client.api_key)
+    if hub is None:
+        hub = hubs[client.api_key] = EskomHub(client, QuotaLedger(hass, client.api_key))
+    hub.entry_ids.add(entry_id)
+    hub.area_counts[entry_id] = area_count
+    return hub
+
+
+def async_release_hub(hass: HomeAssistant, api_key: str, entry_id: str):
+    """Detaches an entry from its hub, discarding the hub once it is unused"""
+    hubs = hass.data[DOMAIN].get(DATA_HUBS, {})
+    hub = hubs.get(api_key)
+    if hub is None:
+        return
+    hub.entry_ids.discard(entry_id)
+    hub.area_counts.pop(entry_id, None)
+    if not hub.entry_ids:
+        hubs.pop(api_key)
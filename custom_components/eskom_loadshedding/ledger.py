@@ -0,0 +1,145 @@
+"""Persisted API quota ledger for the Eskom Loadshedding Interface."""
+
+import hashlib
+import logging
+from collections import deque
+from datetime import datetime, timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    LEDGER_MAX_CALLS,
+    LEDGER_RATE_WINDOW,
+    LEDGER_SAVE_DELAY,
+    LEDGER_STORAGE_VERSION,
+)
+from .models import Allowance, isoformat
+from .scheduler import next_quota_reset
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+class QuotaLedger:
+    """
+    Counts the API calls made with an API key between allowance checks
+
+    The allowance reported by /api_allowance is taken as the starting point, after
+    which every billed call is counted locally. This keeps the remaining quota up to
+    date without querying the allowance on every refresh. The count restarts when
+    the quota resets, and is reconciled with the API again afterwards.
+    """
+
+    def __init__(self, hass: HomeAssistant, api_key: str):
+        """Initializes class parameters"""
+        # The API key itself is not used in the storage key, as it is a secret
+        digest = hashlib.sha256(api_key.encode()).hexdigest()[:16]
+        self._store = Store(hass, LEDGER_STORAGE_VERSION, f"{DOMAIN}.{digest}.ledger")
+        self._loaded = False
+        self.count = None
+        self.limit = None
+        self.type = None
+        self.reconciled_at = None
+        self.quota_reset = None
+        # Times of the most recent billed calls, used to estimate the call rate
+        self.calls = deque(maxlen=LEDGER_MAX_CALLS)
+
+    async def async_load(self) -> None:
+        """Loads the stored ledger, once per ledger"""
+        if self._loaded:
+            return
+        self._loaded = True
+        stored = await self._store.async_load()
+        if not stored:
+            return
+
+        self.count = stored["count"]
+        self.limit = stored["limit"]
+        self.type = stored["type"]
+        self.reconciled_at = dt_util.parse_datetime(stored["reconciled_at"] or "")
+        self.quota_reset = dt_util.parse_datetime(stored["quota_reset"] or "")
+        self.calls.extend(dt_util.parse_datetime(call) for call in stored["calls"])
+        _LOGGER.debug("Restored quota ledger reconciled at %s", self.reconciled_at)
+
+    @callback
+    def record_call(self) -> None:
+        """Counts a call which was billed against the quota"""
+        now = dt_util.utcnow()
+        self._roll_over(now)
+        self.calls.append(now)
+        if self.count is not None:
+            self.count += 1
+        self._store.async_delay_save(self._data_to_save, LEDGER_SAVE_DELAY)
+
+    @callback
+    def reconcile(self, allowance: Allowance) -> None:
+        """Replaces the local count with the allowance reported by the API"""
+        now = dt_util.utcnow()
+        if self.count is not None and self.count != allowance.count:
+            _LOGGER.debug(
+                "Quota ledger counted %s calls, API reported %s",
+                self.count,
+                allowance.count,
+            )
+        self.count = allowance.count
+        self.limit = allowance.limit
+        self.type = allowance.type
+        self.reconciled_at = now
+        self.quota_reset = next_quota_reset(now)
+        self._store.async_delay_save(self._data_to_save, LEDGER_SAVE_DELAY)
+
+    def reconcile_due(self, now: datetime) -> bool:
+        """Whether the ledger has not been reconciled since the quota last reset"""
+        return self.reconciled_at is None or now >= self.quota_reset
+
+    def allowance(self, now: datetime) -> Allowance | None:
+        """Returns the current allowance, or None if it has never been reconciled"""
+        self._roll_over(now)
+        if self.count is None:
+            return None
+        return Allowance(count=self.count, limit=self.limit, allowance_type=self.type)
+
+    def projected_exhaustion(self, now: datetime) -> datetime | None:
+        """
+        Projects when the quota runs out at the recent call rate
+
+        Returns:
+            The projected time, or None if the quota is not expected to run out
+            before it resets
+
+        """
+        allowance = self.allowance(now)
+        if allowance is None:
+            return None
+        if allowance.remaining <= 0:
+            return now
+
+        window_start = now - timedelta(seconds=LEDGER_RATE_WINDOW)
+        recent = [call for call in self.calls if call > window_start]
+        if len(recent) < 2 or recent[0] >= now:
+            return None
+        rate = len(recent) / (now - recent[0]).total_seconds()
+        exhaustion = now + timedelta(seconds=allowance.remaining / rate)
+        return exhaustion if exhaustion < next_quota_reset(now) else None
+
+    def _roll_over(self, now: datetime) -> None:
+        # Start counting from zero once the quota has reset. The count is reconciled
+        # with the API on the next refresh
+        if self.quota_reset is not None and now >= self.quota_reset:
+            if self.count is not None:
+                self.count = 0
+            self.quota_reset = next_quota_reset(now)
+            self.reconciled_at = None
+
+    @callback
+    def _data_to_save(self) -> dict:
+        return {
+            "count": self.count,
+            "limit": self.limit,
+            "type": self.type,
+            "reconciled_at": isoformat(self.reconciled_at),
+            "quota_reset": isoformat(self.quota_reset),
+            "calls": [call.isoformat() for call in self.calls],
+        }
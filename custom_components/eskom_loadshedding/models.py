@@ -0,0 +1,465 @@
+"""Parsed data models for the Eskom Loadshedding Interface."""
+
+import copy
+import hashlib
+import re
+from bisect import bisect_left, bisect_right
+from datetime import date, datetime, time, timedelta, timezone
+from itertools import accumulate
+from operator import attrgetter, itemgetter
+
+from homeassistant.helpers.json import json_dumps_sorted
+
+# Schedule times are provided without an offset and are always in SAST
+SCHEDULE_TIME_ZONE = timezone(timedelta(hours=2))
+
+
+class StageStatus:
+    """Loadshedding status of a single status area"""
+
+    __slots__ = ("name", "stage", "stage_updated", "next_stages")
+
+    def __init__(
+        self,
+        name: str,
+        stage: int | None,
+        stage_updated: datetime | None,
+        next_stages: list[tuple[int, datetime]] = None,
+    ):
+        """Initializes class parameters"""
+        self.name = name
+        self.stage = stage
+        self.stage_updated = stage_updated
+        self.next_stages = next_stages or []
+
+
+class LoadsheddingEvent:
+    """A single loadshedding event or schedule slot"""
+
+    __slots__ = ("start", "end", "note", "stage")
+
+    def __init__(self, start: datetime, end: datetime, note: str, stage: int | None):
+        """Initializes class parameters"""
+        self.start = start
+        self.end = end
+        self.note = note
+        self.stage = stage
+
+
+class EventIndex:
+    """
+    Sorted interval index used to answer calendar window queries
+
+    Events are sorted by start time alongside a running maximum of their end times.
+    Both arrays are non-decreasing, so the events overlapping a window can be found
+    by bisection instead of scanning every event.
+    """
+
+    __slots__ = ("events", "_starts", "_max_ends")
+
+    def __init__(self, events: list[LoadsheddingEvent]):
+        """Initializes class parameters"""
+        self.events = sorted(events, key=attrgetter("start"))
+        self._starts = [event.start for event in self.events]
+        self._max_ends = list(accumulate((event.end for event in self.events), max))
+
+    def overlapping(self, start: datetime, end: datetime) -> list[LoadsheddingEvent]:
+        """Returns the events which overlap the window from start to end"""
+        # Events before lo all end before the window starts, and events from hi
+        # onwards all start after the window ends
+        lo = bisect_right(self._max_ends, start)
+        hi = bisect_left(self._starts, end)
+        return [event for event in self.events[lo:hi] if event.end > start]
+
+    @property
+    def end(self) -> datetime | None:
+        """The time at which the last event ends"""
+        return self._max_ends[-1] if self._max_ends else None
+
+    def next_event(self, now: datetime) -> LoadsheddingEvent | None:
+        """Returns the event in progress at now, or else the next event to start"""
+        for event in self.events[bisect_right(self._max_ends, now) :]:
+            if event.end > now:
+                return event
+        return None
+
+    def next_boundary(self, now: datetime) -> datetime | None:
+        """Returns the next time after now at which an event starts or ends"""
+        event = self.next_event(now)
+        if event is None:
+            return None
+        return event.start if event.start > now else event.end
+
+
+class OutageTimeline:
+    """
+    Merged outage intervals of an area, used to answer rolling aggregate queries
+
+    Overlapping and back-to-back events are merged into non-overlapping intervals,
+    and the cumulative outage duration up to the start of each interval is kept, so
+    that the outage time within any window is found by bisection.
+    """
+
+    __slots__ = ("starts", "ends", "_cumulative")
+
+    def __init__(self, events: list[LoadsheddingEvent]):
+        """Initializes class parameters"""
+        starts, ends = [], []
+        for event in sorted(events, key=attrgetter("start")):
+            if ends and event.start <= ends[-1]:
+                ends[-1] = max(ends[-1], event.end)
+            else:
+                starts.append(event.start)
+                ends.append(event.end)
+        self.starts = starts
+        self.ends = ends
+        self._cumulative = [
+            0.0,
+            *accumulate(
+                (end - start).total_seconds()
+                for start, end in zip(starts, ends, strict=True)
+            ),
+        ]
+
+    def _outage_before(self, when: datetime) -> float:
+        """Returns the total outage time in seconds before a given time"""
+        index = bisect_right(self.starts, when)
+        total = self._cumulative[index]
+        if index and self.ends[index - 1] > when:
+            # Exclude the remainder of the outage in progress
+            total -= (self.ends[index - 1] - when).total_seconds()
+        return total
+
+    def outage_seconds(self, start: datetime, end: datetime) -> float:
+        """Returns the total outage time in seconds within the window"""
+        return self._outage_before(end) - self._outage_before(start)
+
+    def in_outage(self, when: datetime) -> bool:
+        """Whether an outage is in progress at a given time"""
+        index = bisect_right(self.starts, when)
+        return bool(index) and self.ends[index - 1] > when
+
+    def next_outage(self, now: datetime) -> datetime | None:
+        """Returns the start of the outage in progress, or else of the next outage"""
+        index = bisect_right(self.ends, now)
+        return self.starts[index] if index < len(self.starts) else None
+
+    def starts_after(self, now: datetime) -> list[datetime]:
+        """Returns the start times of the outages which start after now"""
+        return self.starts[bisect_right(self.starts, now) :]
+
+    def next_boundary(self, now: datetime) -> datetime | None:
+        """Returns the next time after now at which an outage starts or ends"""
+        index = bisect_right(self.ends, now)
+        if index == len(self.starts):
+            return None
+        return self.starts[index] if self.starts[index] > now else self.ends[index]
+
+    def longest_gap(self, start: datetime, end: datetime) -> timedelta:
+        """Returns the longest time without an outage within the window"""
+        longest = timedelta(0)
+        cursor = start
+        index = bisect_right(self.ends, start)
+        while index < len(self.starts) and self.starts[index] < end:
+            longest = max(longest, self.starts[index] - cursor)
+            cursor = max(cursor, self.ends[index])
+            index += 1
+        return max(longest, end - cursor)
+
+
+class AreaInformation:
+    """Events and schedule of the configured area"""
+
+    __slots__ = (
+        "name",
+        "region",
+        "events",
+        "schedule",
+        "event_index",
+        "schedule_index",
+        "outages",
+        "_stage_schedules",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        region: str,
+        events: list[LoadsheddingEvent],
+        schedule: list[LoadsheddingEvent],
+    ):
+        """Initializes class parameters"""
+        self.name = name
+        self.region = region
+        self.events = events
+        self.schedule = schedule
+        self.event_index = EventIndex(events)
+        self.schedule_index = EventIndex(schedule)
+        self.outages = OutageTimeline(events)
+        self._stage_schedules = {}
+
+    def stage_schedule(self, stage: int) -> EventIndex:
+        """Returns an index of the schedule slots of a single stage"""
+        # Filtered schedules are cached per stage for as long as the schedule is
+        # unchanged, since a new schedule is always parsed into a new instance
+        index = self._stage_schedules.get(stage)
+        if index is None:
+            index = EventIndex([slot for slot in self.schedule if slot.stage == stage])
+            self._stage_schedules[stage] = index
+        return index
+
+    def merged(self) -> "AreaInformation":
+        """Returns a copy of the area information with adjacent events merged"""
+        return AreaInformation(
+            name=self.name,
+            region=self.region,
+            # The schedule lists every stage, while the events form a single
+            # sequence of outages
+            events=merge_events(self.events, per_stage=False),
+            schedule=merge_events(self.schedule),
+        )
+
+    def with_events(self, events: list[LoadsheddingEvent]) -> "AreaInformation":
+        """Returns a copy of the area information with different events"""
+        area_information = copy.copy(self)
+        area_information.events = events
+        area_information.event_index = EventIndex(events)
+        area_information.outages = OutageTimeline(events)
+        return area_information
+
+
+class Allowance:
+    """API quota associated with the API key"""
+
+    __slots__ = ("count", "limit", "type")
+
+    def __init__(self, count: int, limit: int, allowance_type: str):
+        """Initializes class parameters"""
+        self.count = count
+        self.limit = limit
+        self.type = allowance_type
+
+    @property
+    def remaining(self) -> int:
+        """The number of API calls remaining"""
+        return self.limit - self.count
+
+
+def merge_events(
+    events: list[LoadsheddingEvent], per_stage: bool = True
+) -> list[LoadsheddingEvent]:
+    """
+    Merges overlapping and back-to-back events
+
+    Args:
+        events (list): The events to merge, in any order
+        per_stage (bool): Whether only events of the same stage are merged. Otherwise
+            an outage which runs across a stage change becomes a single event, with
+            the highest stage and the notes of every stage it spans
+
+    Returns:
+        New events sorted by start time, where slots such as 10:00-12:30 and
+        12:30-14:30 become a single event from 10:00 to 14:30
+
+    """
+    merged = []
+    # The most recent merged event of each stage, or of any stage when not merging
+    # per stage, which later events may extend
+    latest = {}
+    for event in sorted(events, key=attrgetter("start")):
+        key = (event.stage, event.note) if per_stage else None
+        previous = latest.get(key)
+        if previous is not None and event.start <= previous.end:
+            previous.end = max(previous.end, event.end)
+            if event.note not in previous.note.split(", "):
+                previous.note = f"{previous.note}, {event.note}"
+            if event.stage is not None and (previous.stage or 0) < event.stage:
+                previous.stage = event.stage
+            continue
+        latest[key] = LoadsheddingEvent(event.start, event.end, event.note, event.stage)
+        merged.append(latest[key])
+    return merged
+
+
+def parse_stage(note: str) -> int | None:
+    """Extracts the first number in an event note such as "Stage 2" as the stage"""
+    matches = re.findall(r"\d+", note)
+    if matches:
+        return int(matches[0])
+    return None
+
+
+def parse_status(payload: dict) -> dict[str, StageStatus]:
+    """Parses a /status response into the status of each status area"""
+    statuses = {}
+    for area, status in payload["status"].items():
+        stage = status.get("stage")
+        stage_updated = status.get("stage_updated")
+        statuses[area] = StageStatus(
+            name=status.get("name"),
+            stage=int(stage) if stage else None,
+            stage_updated=datetime.fromisoformat(stage_updated)
+            if stage_updated
+            else None,
+            next_stages=sorted(
+                (
+                    (
+                        int(next_stage["stage"]),
+                        datetime.fromisoformat(next_stage["stage_start_timestamp"]),
+                    )
+                    for next_stage in status.get("next_stages", [])
+                ),
+                key=itemgetter(1),
+            ),
+        )
+    return statuses
+
+
+def parse_schedule(schedule: dict) -> list[LoadsheddingEvent]:
+    """Expands an /area schedule into an event for every slot of every stage"""
+    events = []
+    for day in schedule.get("days", []):
+        day_date = date.fromisoformat(day["date"])
+        for n, stage in enumerate(day["stages"]):
+            for time_range in stage:
+                # Extract the start and end time from the provided time range
+                times = re.findall(r"\d\d:\d\d", time_range)
+                start_time = datetime.combine(
+                    day_date, time.fromisoformat(times[0]), SCHEDULE_TIME_ZONE
+                )
+                end_time = datetime.combine(
+                    day_date, time.fromisoformat(times[1]), SCHEDULE_TIME_ZONE
+                )
+
+                # If the end time was earlier than the start time it means that the
+                # slot ran into the next day i.e. 22:30-00:30
+                if end_time < start_time:
+                    end_time += timedelta(days=1)
+
+                events.append(
+                    LoadsheddingEvent(
+                        start=start_time,
+                        end=end_time,
+                        note=f"Stage {n + 1}",
+                        stage=n + 1,
+                    )
+                )
+    return events
+
+
+def parse_area_information(payload: dict) -> AreaInformation:
+    """Parses an /area response into the area events and schedule"""
+    info = payload.get("info", {})
+    return AreaInformation(
+        name=info.get("name"),
+        region=info.get("region"),
+        events=[
+            LoadsheddingEvent(
+                start=datetime.fromisoformat(event["start"]),
+                end=datetime.fromisoformat(event["end"]),
+                note=event["note"],
+                stage=parse_stage(event["note"]),
+            )
+            for event in payload.get("events", [])
+        ],
+        schedule=parse_schedule(payload.get("schedule", {})),
+    )
+
+
+def parse_allowance(payload: dict) -> Allowance:
+    """Parses an /api_allowance response"""
+    allowance = payload["allowance"]
+    return Allowance(
+        count=int(allowance["count"]),
+        limit=int(allowance["limit"]),
+        allowance_type=allowance["type"],
+    )
+
+
+def project_status(payload: dict) -> dict:
+    """Projects a /status response down to the fields used by parse_status"""
+    return {
+        "status": {
+            area: {
+                "name": status.get("name"),
+                "stage": status.get("stage"),
+                "stage_updated": status.get("stage_updated"),
+                "next_stages": [
+                    {
+                        "stage": next_stage["stage"],
+                        "stage_start_timestamp": next_stage["stage_start_timestamp"],
+                    }
+                    for next_stage in status.get("next_stages", [])
+                ],
+            }
+            for area, status in payload["status"].items()
+        }
+    }
+
+
+def project_area_information(payload: dict) -> dict:
+    """Projects an /area response down to the fields used by parse_area_information"""
+    info = payload.get("info", {})
+    return {
+        "events": [
+            {"start": event["start"], "end": event["end"], "note": event["note"]}
+            for event in payload.get("events", [])
+        ],
+        "info": {"name": info.get("name"), "region": info.get("region")},
+        "schedule": {
+            "days": [
+                {"date": day["date"], "stages": day["stages"]}
+                for day in payload.get("schedule", {}).get("days", [])
+            ]
+        },
+    }
+
+
+def project_allowance(payload: dict) -> dict:
+    """Projects an /api_allowance response down to the fields used by parse_allowance"""
+    allowance = payload["allowance"]
+    return {
+        "allowance": {
+            "count": allowance["count"],
+            "limit": allowance["limit"],
+            "type": allowance["type"],
+        }
+    }
+
+
+def fingerprint(payload) -> str:
+    """Returns a digest of a response which only changes when its content changes"""
+    encoded = json_dumps_sorted(payload).encode()
+    return hashlib.blake2b(encoded, digest_size=16).hexdigest()
+
+
+# Projections applied to each response before it is stored, so that fields which
+# are never used are not kept in memory, persisted or fingerprinted
+PROJECTIONS = {
+    "allowance": project_allowance,
+    "status": project_status,
+    "area_information": project_area_information,
+}
+
+
+def area_key(area_id: str) -> str:
+    """Returns the coordinator data key of the information of an area"""
+    return f"area_information:{area_id}"
+
+
+def data_kind(key: str) -> str:
+    """Returns the kind of data stored under a coordinator data key"""
+    return key.partition(":")[0]
+
+
+def isoformat(value: datetime | None) -> str | None:
+    """Returns a time as an ISO 8601 string, or None if there is no time"""
+    return value.isoformat() if value else None
+
+
+# Parsers used to normalise the response stored under each kind of data key
+PARSERS = {
+    "allowance": parse_allowance,
+    "status": parse_status,
+    "area_information": parse_area_information,
+}
@@ -0,0 +1,56 @@
+"""Local schedule engine for the Eskom Loadshedding Interface."""
+
+from bisect import bisect_right
+from datetime import datetime
+
+from .const import CAPE_TOWN_STATUS_AREA_ID, NATIONAL_STATUS_AREA_ID
+from .models import LoadsheddingEvent, StageStatus
+
+
+def status_area_for(area_id: str) -> str:
+    """Returns the status area whose stage applies to an EskomSePush area ID"""
+    if area_id and area_id.startswith(CAPE_TOWN_STATUS_AREA_ID):
+        return CAPE_TOWN_STATUS_AREA_ID
+    return NATIONAL_STATUS_AREA_ID
+
+
+def stage_timeline(status: StageStatus) -> tuple[tuple[int, datetime | None], ...]:
+    """
+    Returns the current and announced stages of a status area
+
+    The first item is the current stage, which applies from now until the start of
+    the first announced stage change.
+    """
+    return ((status.stage or 0, None), *status.next_stages)
+
+
+def derive_events(
+    schedule: list[LoadsheddingEvent],
+    timeline: tuple[tuple[int, datetime | None], ...],
+    now: datetime,
+) -> list[LoadsheddingEvent]:
+    """
+    Derives upcoming loadshedding events from an area schedule and stage timeline
+
+    Args:
+        schedule (list): The expanded area schedule, with a slot per stage
+        timeline (tuple): The stage timeline returned by stage_timeline
+        now (datetime): The current time
+
+    Returns:
+        The schedule slots of the stage in effect at the start of each slot
+
+    """
+    change_times = [start for _, start in timeline[1:]]
+    events = []
+    for slot in schedule:
+        if slot.end <= now:
+            continue
+        stage = timeline[bisect_right(change_times, slot.start)][0]
+        if stage and slot.stage == stage:
+            events.append(
+                LoadsheddingEvent(
+                    start=slot.start, end=slot.end, note=f"Stage {stage}", stage=stage
+                )
+            )
+    return events
@@ -0,0 +1,169 @@
+"""Refresh scheduling for the Eskom Loadshedding Interface."""
+
+import math
+from datetime import UTC, datetime, time, timedelta
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    ADAPTIVE_QUOTA_RESERVE,
+    BOUNDARY_MIN_SCAN_PERIOD,
+    BOUNDARY_QUIET_SCAN_PERIOD,
+    BOUNDARY_REFRESH_LEAD,
+    MAX_ADAPTIVE_SCAN_PERIOD,
+    MIN_SCAN_PERIOD,
+    QUOTA_RESET_TIME_ZONE,
+    REFRESH_MARGIN,
+)
+
+
+def expired_keys(
+    keys: tuple[str, ...],
+    last_updates: dict[str, datetime],
+    max_ages: dict[str, timedelta],
+    now: datetime,
+) -> tuple[str, ...]:
+    """
+    Determines which data keys are due to be fetched again
+
+    Args:
+        keys (tuple): The data keys to check
+        last_updates (dict): The time at which each key was last fetched
+        max_ages (dict): The maximum age of the data for each key
+        now (datetime): The current time
+
+    Returns:
+        The keys which have never been fetched or whose data has expired
+
+    """
+    # Allow a margin so that scheduled refreshes which fire slightly early still
+    # treat data fetched one interval ago as expired
+    margin = timedelta(seconds=REFRESH_MARGIN)
+    return tuple(
+        key
+        for key in keys
+        if key not in last_updates or now - last_updates[key] >= max_ages[key] - margin
+    )
+
+
+def round_robin_keys(
+    keys: tuple[str, ...],
+    last_updates: dict[str, datetime],
+    budget: int | None,
+) -> tuple[str, ...]:
+    """
+    Selects the keys to fetch when not all of them fit in the quota budget
+
+    Args:
+        keys (tuple): The data keys which are due to be fetched
+        last_updates (dict): The time at which each key was last fetched
+        budget (int): The maximum number of keys to fetch, or None for no limit
+
+    Returns:
+        Up to budget keys, starting with those fetched least recently so that every
+        key gets its turn over successive refreshes
+
+    """
+    never = datetime.min.replace(tzinfo=UTC)
+    ordered = sorted(keys, key=lambda key: last_updates.get(key) or never)
+    return tuple(ordered if budget is None else ordered[: max(budget, 0)])
+
+
+def next_quota_reset(now: datetime) -> datetime:
+    """Returns the time at which the daily API quota next resets"""
+    time_zone = dt_util.get_time_zone(QUOTA_RESET_TIME_ZONE)
+    tomorrow = now.astimezone(time_zone).date() + timedelta(days=1)
+    return datetime.combine(tomorrow, time(), tzinfo=time_zone)
+
+
+def adaptive_scan_period(remaining: int, calls_per_refresh: int, now: datetime) -> int:
+    """
+    Calculates a scan period which spreads the remaining quota until it resets
+
+    Args:
+        remaining (int): The number of API calls remaining in the quota
+        calls_per_refresh (int): The number of API calls spent per refresh
+        now (datetime): The current time
+
+    Returns:
+        The scan period in seconds
+
+    """
+    seconds_to_reset = (next_quota_reset(now) - now).total_seconds()
+    refreshes = (remaining - ADAPTIVE_QUOTA_RESERVE) // max(calls_per_refresh, 1)
+
+    if refreshes < 1:
+        # The quota is spent, so wait for it to reset before trying again
+        return int(seconds_to_reset) + 1
+
+    # Spend the remaining budget evenly over the rest of the quota day, speeding up
+    # when calls are left over and slowing down as the quota runs low
+    period = seconds_to_reset / refreshes
+    return int(min(max(period, MIN_SCAN_PERIOD), MAX_ADAPTIVE_SCAN_PERIOD))
+
+
+def boundary_scan_period(
+    outage_starts: list[datetime], stage_changes: list[datetime], now: datetime
+) -> int:
+    """
+    Calculates a scan period which refreshes around the next known boundary
+
+    Outages are confirmed BOUNDARY_REFRESH_LEAD seconds before they start, so that a
+    late schedule change is seen before the outage rather than after it. Stage
+    changes are confirmed just after they take effect, once /status reports them.
+
+    Args:
+        outage_starts (list): The start times of the upcoming outages
+        stage_changes (list): The times of the announced stage changes
+        now (datetime): The current time
+
+    Returns:
+        The scan period in seconds, which is the quiet scan period if no boundary
+        needs confirming sooner
+
+    """
+    lead = timedelta(seconds=BOUNDARY_REFRESH_LEAD)
+    margin = timedelta(seconds=REFRESH_MARGIN)
+    earliest = now + timedelta(seconds=BOUNDARY_MIN_SCAN_PERIOD)
+
+    # Outages starting within the lead time have already been confirmed by this
+    # refresh, and so have stage changes which have already taken effect
+    targets = [start - lead for start in outage_starts if start - now > lead]
+    targets.extend(change + margin for change in stage_changes if change > now)
+    if not targets:
+        return BOUNDARY_QUIET_SCAN_PERIOD
+    period = (max(min(targets), earliest) - now).total_seconds()
+    return int(min(period, BOUNDARY_QUIET_SCAN_PERIOD))
+
+
+def area_budget(
+    remaining: int,
+    calls_per_refresh: int,
+    area_count: int,
+    scan_period: timedelta,
+    now: datetime,
+) -> int:
+    """
+    Calculates how many areas an entry can fetch per refresh within the quota
+
+    Args:
+        remaining (int): The number of API calls remaining in the quota
+        calls_per_refresh (int): The number of API calls spent per refresh when
+            every area of every entry sharing the API key is fetched
+        area_count (int): The number of areas monitored by the entry
+        scan_period (timedelta): The time between refreshes
+        now (datetime): The current time
+
+    Returns:
+        The number of areas to fetch, which is at least one while any quota remains
+        so that the areas keep taking turns
+
+    """
+    available = remaining - ADAPTIVE_QUOTA_RESERVE
+    if available <= 0:
+        return 0
+
+    # The share of a full refresh that the quota can afford until it resets
+    refreshes = max((next_quota_reset(now) - now) / scan_period, 1)
+    affordable = available / refreshes / max(calls_per_refresh, 1)
+    return min(max(math.floor(area_count * affordable), 1), area_count)
@@ -1,68 +1,141 @@
 """Sensor platform for Eskom Loadshedding Interface."""
 
-import re
-from datetime import datetime
+import math
+from datetime import timedelta
 
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity
+from homeassistant.const import EntityCategory, UnitOfTime
+from homeassistant.util import dt as dt_util
 
 from .const import (
+    API_CALLS_ID,
+    API_CALLS_NAME,
+    API_LATENCY_ID,
+    API_LATENCY_NAME,
+    API_STATS_SENSOR_ICON,
+    AREA_NEXT_OUTAGE_NAME,
+    AREA_OUTAGE_MINUTES_NAME,
+    AREA_POWERED_WINDOW_NAME,
+    AREA_STATUS_NAME,
     CAPE_TOWN_STATUS_AREA_ID,
     CAPE_TOWN_STATUS_ID,
     CAPE_TOWN_STATUS_NAME,
     DOMAIN,
+    LOCAL_NEXT_OUTAGE_ID,
+    LOCAL_NEXT_OUTAGE_NAME,
+    LOCAL_OUTAGE_MINUTES_ID,
+    LOCAL_OUTAGE_MINUTES_NAME,
+    LOCAL_POWERED_WINDOW_ID,
+    LOCAL_POWERED_WINDOW_NAME,
     LOCAL_STATUS_ID,
     LOCAL_STATUS_NAME,
     LOCAL_STATUS_SENSOR_ICON,
     NATIONAL_SATUS_NAME,
     NATIONAL_STATUS_AREA_ID,
     NATIONAL_STATUS_ID,
+    OUTAGE_MINUTES_WINDOW,
+    OUTAGE_SENSOR_ICON,
+    POWERED_WINDOW_SENSOR_ICON,
     QUOTA_ID,
     QUOTA_NAME,
     QUOTA_SENSOR_ICON,
     STATUS_SENSOR_ICON,
 )
-from .entity import EskomEntity
+from .entity import EskomEntity, area_entity_naming
 
 
 async def async_setup_entry(hass, entry, async_add_devices):
     """Setup sensor platform."""
     coordinator = hass.data[DOMAIN][entry.entry_id]
-    async_add_devices(
-        [
-            LoadsheddingStatusSensor(
-                coordinator,
-                entry,
-                area=NATIONAL_STATUS_AREA_ID,
-                sensor_id=NATIONAL_STATUS_ID,
-                friendly_name=NATIONAL_SATUS_NAME,
+    async_add_devices(build_entities(coordinator, entry))
+
+
+def build_entities(coordinator, entry) -> list[EskomEntity]:
+    """Creates the sensors of a config entry"""
+    # Each monitored area has its own status and outage aggregate sensors
+    area_sensors = []
+    for key in coordinator.area_keys:
+        for sensor_class, sensor_id, name, area_name in (
+            (
+                LoadsheddingAreaInfoSensor,
+                LOCAL_STATUS_ID,
+                LOCAL_STATUS_NAME,
+                AREA_STATUS_NAME,
             ),
-            LoadsheddingStatusSensor(
-                coordinator,
-                entry,
-                area=CAPE_TOWN_STATUS_AREA_ID,
-                sensor_id=CAPE_TOWN_STATUS_ID,
-                friendly_name=CAPE_TOWN_STATUS_NAME,
+            (
+                LoadsheddingNextOutageSensor,
+                LOCAL_NEXT_OUTAGE_ID,
+                LOCAL_NEXT_OUTAGE_NAME,
+                AREA_NEXT_OUTAGE_NAME,
             ),
-            LoadsheddingAreaInfoSensor(
-                coordinator,
-                entry,
-                sensor_id=LOCAL_STATUS_ID,
-                friendly_name=LOCAL_STATUS_NAME,
+            (
+                LoadsheddingOutageMinutesSensor,
+                LOCAL_OUTAGE_MINUTES_ID,
+                LOCAL_OUTAGE_MINUTES_NAME,
+                AREA_OUTAGE_MINUTES_NAME,
             ),
-            LoadsheddingAPIQuotaSensor(
-                coordinator,
-                entry,
-                sensor_id=QUOTA_ID,
-                friendly_name=QUOTA_NAME,
+            (
+                LoadsheddingPoweredWindowSensor,
+                LOCAL_POWERED_WINDOW_ID,
+                LOCAL_POWERED_WINDOW_NAME,
+                AREA_POWERED_WINDOW_NAME,
             ),
-        ]
-    )
+        ):
+            sensor_id, friendly_name = area_entity_naming(
+                coordinator, key, sensor_id, name, area_name
+            )
+            area_sensors.append(
+                sensor_class(
+                    coordinator,
+                    entry,
+                    area_key=key,
+                    sensor_id=sensor_id,
+                    friendly_name=friendly_name,
+                )
+            )
+
+    return [
+        LoadsheddingStatusSensor(
+            coordinator,
+            entry,
+            area=NATIONAL_STATUS_AREA_ID,
+            sensor_id=NATIONAL_STATUS_ID,
+            friendly_name=NATIONAL_SATUS_NAME,
+        ),
+        LoadsheddingStatusSensor(
+            coordinator,
+            entry,
+            area=CAPE_TOWN_STATUS_AREA_ID,
+            sensor_id=CAPE_TOWN_STATUS_ID,
+            friendly_name=CAPE_TOWN_STATUS_NAME,
+        ),
+        *area_sensors,
+        LoadsheddingAPIQuotaSensor(
+            coordinator,
+            entry,
+            sensor_id=QUOTA_ID,
+            friendly_name=QUOTA_NAME,
+        ),
+        LoadsheddingAPICallsSensor(
+            coordinator,
+            entry,
+            sensor_id=API_CALLS_ID,
+            friendly_name=API_CALLS_NAME,
+        ),
+        LoadsheddingAPILatencySensor(
+            coordinator,
+            entry,
+            sensor_id=API_LATENCY_ID,
+            friendly_name=API_LATENCY_NAME,
+        ),
+    ]
 
 
 class LoadsheddingStatusSensor(EskomEntity, SensorEntity):
     """Eskom Stage Sensor class."""
 
     _attr_has_entity_name = True
+    data_keys = ("status",)
 
     def __init__(
         self, coordinator, config_entry, area: str, sensor_id: str, friendly_name: str
@@ -86,14 +159,9 @@ class LoadsheddingStatusSensor(EskomEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        value = (
-            self.coordinator.data.get("status", {})
-            .get("status", {})
-            .get(self.area, {})
-            .get("stage")
-        )
-        if value:
-            return int(value)
+        status = self.coordinator.data["status"].get(self.area)
+        if status:
+            return status.stage
 
     @property
     def icon(self):
@@ -103,26 +171,13 @@ class LoadsheddingStatusSensor(EskomEntity, SensorEntity):
     @property
     def extra_state_attributes(self):
         # Gather data from coordinator
-        area_name = (
-            self.coordinator.data.get("status", {})
-            .get("status", {})
-            .get(self.area, {})
-            .get("name")
-        )
-        stage_updated = (
-            self.coordinator.data.get("status", {})
-            .get("status", {})
-            .get(self.area, {})
-            .get("stage_updated")
-        )
-
-        # Convert time strings to datetimes:
-        time_format = "%Y-%m-%dT%H:%M:%S.%f%z"
-        time_updated = datetime.strptime(stage_updated, time_format)
-        return {
-            "Area Name": area_name,
-            "Time Updated": time_updated,
-        }
+        status = self.coordinator.data["status"].get(self.area)
+        if status:
+            return {
+                "Area Name": status.name,
+                "Time Updated": status.stage_updated,
+            }
+        return None
 
 
 class LoadsheddingAreaInfoSensor(EskomEntity, SensorEntity):
@@ -130,8 +185,12 @@ class LoadsheddingAreaInfoSensor(EskomEntity, SensorEntity):
 
     _attr_has_entity_name = True
 
-    def __init__(self, coordinator, config_entry, sensor_id, friendly_name: str):
+    def __init__(
+        self, coordinator, config_entry, area_key: str, sensor_id, friendly_name: str
+    ):
         """Initialize."""
+        self.area_key = area_key
+        self.data_keys = (area_key,)
         self.sensor_id = sensor_id
         self.friendly_name = friendly_name
         super().__init__(coordinator, config_entry)
@@ -149,15 +208,13 @@ class LoadsheddingAreaInfoSensor(EskomEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        events = self.coordinator.data.get("area_information", {}).get("events", {})
+        events = self.coordinator.data[self.area_key].events
 
         if events:
-            # Extract the first number in the note as the stage for display as an int
-            # This assumes the note is always formatted as "Stage X"
-            matches = re.findall(r"\d+", events[0]["note"])
-            if matches:
-                return int(matches[0])
-            return events[0]["note"]
+            # Display the stage of the next event as an int if the note contains one
+            if events[0].stage is not None:
+                return events[0].stage
+            return events[0].note
         return 0
 
     @property
@@ -165,33 +222,146 @@ class LoadsheddingAreaInfoSensor(EskomEntity, SensorEntity):
         """Return the icon of the sensor."""
         return LOCAL_STATUS_SENSOR_ICON
 
+    def next_state_change(self):
+        # "Currently Loadshedding" changes whenever an event starts or ends
+        return self.coordinator.data[self.area_key].event_index.next_boundary(
+            dt_util.utcnow()
+        )
+
     @property
     def extra_state_attributes(self):
         # Gather data from coordinator
-        events = self.coordinator.data.get("area_information", {}).get("events", {})
-        info = self.coordinator.data.get("area_information", {}).get("info", {})
+        area_information = self.coordinator.data[self.area_key]
 
-        currently_loadshedding = False
-
-        if events:
-            # Determine whether the area is currently loadshedding
-            time_format = "%Y-%m-%dT%H:%M:%S%z"
-            next_event_start = datetime.strptime(events[0]["start"], time_format)
-            next_event_end = datetime.strptime(events[0]["end"], time_format)
-            current_time = datetime.now(next_event_start.tzinfo)
-            currently_loadshedding = next_event_start <= current_time <= next_event_end
+        # Determine whether the area is currently loadshedding
+        current_time = dt_util.utcnow()
+        event = area_information.event_index.next_event(current_time)
+        currently_loadshedding = event is not None and event.start <= current_time
 
         return {
-            "Area": info["name"],
-            "Region": info["region"],
+            "Area": area_information.name,
+            "Region": area_information.region,
             "Currently Loadshedding": currently_loadshedding,
         }
 
 
+class LoadsheddingOutageSensor(EskomEntity, SensorEntity):
+    """Base class of the outage aggregate sensors of an area."""
+
+    _attr_has_entity_name = True
+    _attr_device_class = SensorDeviceClass.DURATION
+    _attr_native_unit_of_measurement = UnitOfTime.MINUTES
+
+    def __init__(
+        self, coordinator, config_entry, area_key: str, sensor_id, friendly_name: str
+    ):
+        """Initialize."""
+        self.area_key = area_key
+        self.data_keys = (area_key,)
+        self.sensor_id = sensor_id
+        self.friendly_name = friendly_name
+        super().__init__(coordinator, config_entry)
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return f"{self.config_entry.entry_id}-{self.sensor_id}"
+
+    @property
+    def name(self):
+        """Return the friendly name of the sensor."""
+        return self.friendly_name
+
+    @property
+    def icon(self):
+        """Return the icon of the sensor."""
+        return OUTAGE_SENSOR_ICON
+
+    @property
+    def outages(self):
+        """The merged outages of the area, precomputed on every data update"""
+        return self.coordinator.data[self.area_key].outages
+
+
+def _next_minute(now):
+    return now.replace(second=0, microsecond=0) + timedelta(minutes=1)
+
+
+class LoadsheddingNextOutageSensor(LoadsheddingOutageSensor):
+    """Minutes until the next outage of an area."""
+
+    @property
+    def native_value(self):
+        """Return the native value of the sensor."""
+        # Return 0 during an outage, as the next outage is already in progress
+        now = dt_util.utcnow()
+        start = self.outages.next_outage(now)
+        if start is None:
+            return None
+        return max(math.ceil((start - now).total_seconds() / 60), 0)
+
+    def next_state_change(self):
+        # Count down on every minute until the next outage starts, then wait for it
+        # to end before counting down to the one after it
+        now = dt_util.utcnow()
+        if self.outages.in_outage(now):
+            return self.outages.next_boundary(now)
+        if self.outages.next_outage(now) is None:
+            return None
+        return _next_minute(now)
+
+
+class LoadsheddingOutageMinutesSensor(LoadsheddingOutageSensor):
+    """Total outage minutes of an area over the next 24 hours."""
+
+    @property
+    def native_value(self):
+        """Return the native value of the sensor."""
+        now = dt_util.utcnow()
+        window_end = now + timedelta(seconds=OUTAGE_MINUTES_WINDOW)
+        return round(self.outages.outage_seconds(now, window_end) / 60)
+
+    def next_state_change(self):
+        # The total only changes while either end of the window is in an outage, so
+        # otherwise wait until one of them reaches the next outage
+        now = dt_util.utcnow()
+        window_end = now + timedelta(seconds=OUTAGE_MINUTES_WINDOW)
+        if self.outages.in_outage(now) or self.outages.in_outage(window_end):
+            return _next_minute(now)
+        window = window_end - now
+        changes = []
+        if (boundary := self.outages.next_boundary(now)) is not None:
+            changes.append(boundary)
+        if (boundary := self.outages.next_boundary(window_end)) is not None:
+            changes.append(boundary - window)
+        return min(changes, default=None)
+
+
+class LoadsheddingPoweredWindowSensor(LoadsheddingOutageSensor):
+    """Longest period without an outage in an area today."""
+
+    @property
+    def icon(self):
+        """Return the icon of the sensor."""
+        return POWERED_WINDOW_SENSOR_ICON
+
+    @property
+    def native_value(self):
+        """Return the native value of the sensor."""
+        start = dt_util.start_of_local_day()
+        gap = self.outages.longest_gap(start, start + timedelta(days=1))
+        return round(gap.total_seconds() / 60)
+
+    def next_state_change(self):
+        # The value only depends on the day, so it changes at midnight
+        return dt_util.start_of_local_day() + timedelta(days=1)
+
+
 class LoadsheddingAPIQuotaSensor(EskomEntity, SensorEntity):
     """Eskom API Quota Sensor class."""
 
     _attr_has_entity_name = True
+    data_keys = ("allowance",)
 
     def __init__(self, coordinator, config_entry, sensor_id, friendly_name: str):
         """Initialize."""
@@ -212,13 +382,9 @@ class LoadsheddingAPIQuotaSensor(EskomEntity, SensorEntity):
     @property
     def native_value(self):
         """Return the native value of the sensor."""
-        # Return the number of API calls remaining as the native sensor value
-        allowance = self.coordinator.data.get("allowance", {}).get("allowance", {})
-
-        if allowance:
-            return int(allowance["limit"]) - int(allowance["count"])
-
-        return None
+        # Return the number of API calls remaining as the native sensor value, as
+        # counted by the quota ledger since the allowance was last checked
+        return self.coordinator.allowance.remaining
 
     @property
     def icon(self):
@@ -228,13 +394,120 @@ class LoadsheddingAPIQuotaSensor(EskomEntity, SensorEntity):
     @property
     def extra_state_attributes(self):
         # Gather data from coordinator
-        allowance = self.coordinator.data.get("allowance", {}).get("allowance", {})
+        allowance = self.coordinator.allowance
+        ledger = self.coordinator.hub.ledger
+        return {
+            "Remaining": allowance.remaining,
+            "Count": allowance.count,
+            "Limit": allowance.limit,
+            "Type": allowance.type,
+            "Last Checked": ledger.reconciled_at,
+            "Projected Exhaustion": ledger.projected_exhaustion(dt_util.utcnow()),
+            "API Circuit": self.coordinator.hub.client.circuit_breaker.state,
+        }
 
-        if allowance:
-            return {
-                "Remaining": int(allowance["limit"]) - int(allowance["count"]),
-                "Count": int(allowance["count"]),
-                "Limit": int(allowance["limit"]),
-                "Type": allowance["type"],
-            }
-        return None
+    def _current_fingerprints(self):
+        # The ledger count and circuit state change without new allowance data
+        return (
+            *super()._current_fingerprints(),
+            self.coordinator.hub.ledger.count,
+            self.coordinator.hub.ledger.reconciled_at,
+            self.coordinator.hub.client.circuit_breaker.state,
+        )
+
+
+class LoadsheddingAPIStatsSensor(EskomEntity, SensorEntity):
+    """Base class of the diagnostic API request statistics sensors."""
+
+    _attr_has_entity_name = True
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, config_entry, sensor_id, friendly_name: str):
+        """Initialize."""
+        self.sensor_id = sensor_id
+        self.friendly_name = friendly_name
+        super().__init__(coordinator, config_entry)
+
+    @property
+    def unique_id(self):
+        """Return a unique ID to use for this entity."""
+        return f"{self.config_entry.entry_id}-{self.sensor_id}"
+
+    @property
+    def name(self):
+        """Return the friendly name of the sensor."""
+        return self.friendly_name
+
+    @property
+    def icon(self):
+        """Return the icon of the sensor."""
+        return API_STATS_SENSOR_ICON
+
+    def _endpoint_stats(self):
+        # The endpoints shared through the hub, followed by those of each area
+        clients = self.coordinator.clients.values()
+        stats = dict(self.coordinator.hub.client.stats)
+        for client in clients:
+            for endpoint, endpoint_stats in client.stats.items():
+                label = (
+                    endpoint if len(clients) == 1 else f"{endpoint} {client.area_id}"
+                )
+                stats[label] = endpoint_stats
+        return stats
+
+    def _current_fingerprints(self):
+        # The statistics change with every request, not just with new data
+        return (
+            *super()._current_fingerprints(),
+            self.native_value,
+            *(stats.requests for stats in self._endpoint_stats().values()),
+        )
+
+
+class LoadsheddingAPICallsSensor(LoadsheddingAPIStatsSensor):
+    """API quota spent by a config entry."""
+
+    @property
+    def native_value(self):
+        """Return the native value of the sensor."""
+        # Return the quota spent on this entry's own endpoints since startup
+        return self.coordinator.quota_spent
+
+    @property
+    def extra_state_attributes(self):
+        hub = self.coordinator.hub
+        attributes = {
+            "Shared Calls": hub.client.quota_spent,
+            "Shared Between Entries": len(hub.entry_ids),
+        }
+        for endpoint, stats in self._endpoint_stats().items():
+            attributes[f"{endpoint} Requests"] = stats.requests
+            attributes[f"{endpoint} Errors"] = sum(stats.errors.values())
+            attributes[f"{endpoint} Skipped"] = stats.skipped
+        return attributes
+
+
+class LoadsheddingAPILatencySensor(LoadsheddingAPIStatsSensor):
+    """API request latency of a config entry."""
+
+    _attr_native_unit_of_measurement = UnitOfTime.MILLISECONDS
+
+    @property
+    def native_value(self):
+        """Return the native value of the sensor."""
+        # Return the worst 95th percentile latency of the recent area requests
+        latencies = [
+            client.stats["/area"].latency_percentile(95)
+            for client in self.coordinator.clients.values()
+            if "/area" in client.stats
+        ]
+        return max(filter(None, latencies), default=None)
+
+    @property
+    def extra_state_attributes(self):
+        attributes = {}
+        for endpoint, stats in self._endpoint_stats().items():
+            attributes[f"{endpoint} p50"] = stats.latency_percentile(50)
+            attributes[f"{endpoint} p95"] = stats.latency_percentile(95)
+        return attributes
@@ -0,0 +1,66 @@
+"""Services for the Eskom Loadshedding Interface."""
+
+import asyncio
+
+import homeassistant.helpers.config_validation as cv
+import voluptuous as vol
+from homeassistant.config_entries import ConfigEntryState
+from homeassistant.core import HomeAssistant, ServiceCall
+from homeassistant.exceptions import ServiceValidationError
+
+from .const import (
+    ATTR_CONFIG_ENTRY_ID,
+    ATTR_ENDPOINTS,
+    DATA_TTL_OPTIONS,
+    DOMAIN,
+    SERVICE_REFRESH,
+)
+
+REFRESH_SCHEMA = vol.Schema(
+    {
+        vol.Optional(ATTR_CONFIG_ENTRY_ID): vol.All(cv.ensure_list, [cv.string]),
+        vol.Optional(ATTR_ENDPOINTS, default=list(DATA_TTL_OPTIONS)): vol.All(
+            cv.ensure_list, [vol.In(DATA_TTL_OPTIONS)]
+        ),
+    }
+)
+
+
+def async_setup_services(hass: HomeAssistant) -> None:
+    """Registers the integration services"""
+
+    async def async_handle_refresh(call: ServiceCall) -> None:
+        """Refreshes the selected endpoints of the selected entries"""
+        if ATTR_CONFIG_ENTRY_ID not in call.data:
+            # Without a target every loaded entry is refreshed, skipping entries
+            # which are disabled or still being set up
+            entries = [
+                entry
+                for entry in hass.config_entries.async_entries(DOMAIN)
+                if entry.state is ConfigEntryState.LOADED
+            ]
+        else:
+            entries = []
+            for entry_id in call.data[ATTR_CONFIG_ENTRY_ID]:
+                entry = hass.config_entries.async_get_entry(entry_id)
+                if (
+                    entry is None
+                    or entry.domain != DOMAIN
+                    or entry.state is not ConfigEntryState.LOADED
+                ):
+                    raise ServiceValidationError(
+                        f"Config entry {entry_id} is not a loaded {DOMAIN} entry"
+                    )
+                entries.append(entry)
+        coordinators = [hass.data[DOMAIN][entry.entry_id] for entry in entries]
+
+        await asyncio.gather(
+            *(
+                coordinator.async_manual_refresh(tuple(call.data[ATTR_ENDPOINTS]))
+                for coordinator in coordinators
+            )
+        )
+
+    hass.services.async_register(
+        DOMAIN, SERVICE_REFRESH, async_handle_refresh, schema=REFRESH_SCHEMA
+    )
@@ -0,0 +1,82 @@
+"""Shared HTTP session and request coalescing for the Eskom Loadshedding Interface."""
+
+import logging
+
+import aiohttp
+from homeassistant.const import EVENT_HOMEASSISTANT_CLOSE
+from homeassistant.core import Event, HomeAssistant, callback
+from homeassistant.helpers.aiohttp_client import SERVER_SOFTWARE
+
+from .const import (
+    DATA_COALESCER,
+    DATA_HUBS,
+    DATA_SESSION,
+    DATA_SESSION_LISTENER,
+    DOMAIN,
+    SESSION_DNS_CACHE_TTL,
+    SESSION_KEEPALIVE_TIMEOUT,
+    SESSION_LIMIT_PER_HOST,
+)
+from .eskom_interface import RequestCoalescer
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+@callback
+def async_get_session(hass: HomeAssistant) -> aiohttp.ClientSession:
+    """
+    Returns the HTTP session used for every EskomSePush request, creating it if required
+
+    A single long-lived session is shared by the config flows and every config entry,
+    so that connections to the API host are kept alive and DNS lookups are cached
+    between requests. Responses are compressed using the encodings which aiohttp can
+    decode (gzip and deflate, and brotli if a brotli decoder is installed).
+    """
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    session = domain_data.get(DATA_SESSION)
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(
+            limit_per_host=SESSION_LIMIT_PER_HOST,
+            ttl_dns_cache=SESSION_DNS_CACHE_TTL,
+            keepalive_timeout=SESSION_KEEPALIVE_TIMEOUT,
+            enable_cleanup_closed=True,
+        )
+        session = domain_data[DATA_SESSION] = aiohttp.ClientSession(
+            connector=connector, headers={"User-Agent": SERVER_SOFTWARE}
+        )
+
+        async def async_close_on_stop(event: Event) -> None:
+            # The listener has fired, so it must not be unsubscribed again
+            domain_data.pop(DATA_SESSION_LISTENER, None)
+            await session.close()
+
+        if (unsub_listener := domain_data.get(DATA_SESSION_LISTENER)) is not None:
+            unsub_listener()
+        domain_data[DATA_SESSION_LISTENER] = hass.bus.async_listen_once(
+            EVENT_HOMEASSISTANT_CLOSE, async_close_on_stop
+        )
+    return session
+
+
+@callback
+def async_get_coalescer(hass: HomeAssistant) -> RequestCoalescer:
+    """Returns the request coalescer shared by every client, creating it if required"""
+    domain_data = hass.data.setdefault(DOMAIN, {})
+    coalescer = domain_data.get(DATA_COALESCER)
+    if coalescer is None:
+        coalescer = domain_data[DATA_COALESCER] = RequestCoalescer(hass)
+    return coalescer
+
+
+async def async_release_session(hass: HomeAssistant) -> None:
+    """Closes the HTTP session once no config entry is using it"""
+    domain_data = hass.data.get(DOMAIN, {})
+    if domain_data.get(DATA_HUBS):
+        return
+    domain_data.pop(DATA_COALESCER, None)
+    if (unsub_listener := domain_data.pop(DATA_SESSION_LISTENER, None)) is not None:
+        unsub_listener()
+    session = domain_data.pop(DATA_SESSION, None)
+    if session is not None:
+        _LOGGER.debug("Closing HTTP session as no entries remain")
+        await session.close()
@@ -0,0 +1,82 @@
+"""Persisted API snapshot for the Eskom Loadshedding Interface."""
+
+import logging
+from datetime import timedelta
+
+from homeassistant.core import HomeAssistant, callback
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    DOMAIN,
+    SNAPSHOT_MAX_AGE,
+    SNAPSHOT_SAVE_DELAY,
+    SNAPSHOT_STORAGE_VERSION,
+)
+from .eskom_interface import EndpointResult
+from .models import isoformat
+
+_LOGGER: logging.Logger = logging.getLogger(__package__)
+
+
+class EskomSnapshot:
+    """
+    Persists the last good API responses of a config entry
+
+    The snapshot allows entities to be populated immediately at startup, before (or
+    without) reaching the API. Each response is stored with the time it was fetched
+    so that its staleness is known when it is restored.
+    """
+
+    def __init__(self, hass: HomeAssistant, entry_id: str):
+        """Initializes class parameters"""
+        self._store = Store(
+            hass, SNAPSHOT_STORAGE_VERSION, f"{DOMAIN}.{entry_id}.snapshot"
+        )
+        self._results = {}
+        self.saved_at = None
+
+    async def async_load(self) -> dict[str, EndpointResult]:
+        """Loads the stored results, discarding any that are too stale to use"""
+        stored = await self._store.async_load()
+        if not stored:
+            return {}
+
+        self.saved_at = dt_util.parse_datetime(stored["saved_at"])
+        oldest = dt_util.utcnow() - timedelta(seconds=SNAPSHOT_MAX_AGE)
+        results = {}
+        for key, result in stored["results"].items():
+            last_success = dt_util.parse_datetime(result["last_success"])
+            if last_success is None or last_success < oldest:
+                continue
+            results[key] = EndpointResult(
+                data=result["data"], last_success=last_success
+            )
+
+        _LOGGER.debug("Restored %s from snapshot saved at %s", results, self.saved_at)
+        return results
+
+    @callback
+    def async_schedule_save(self, results: dict[str, EndpointResult]) -> None:
+        """Schedules the results to be saved, batching frequent updates"""
+        self._results = results
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    async def async_remove(self) -> None:
+        """Removes the stored snapshot"""
+        await self._store.async_remove()
+
+    @callback
+    def _data_to_save(self) -> dict:
+        self.saved_at = dt_util.utcnow()
+        return {
+            "saved_at": self.saved_at.isoformat(),
+            "results": {
+                key: {
+                    "data": result.data,
+                    "last_success": isoformat(result.last_success),
+                }
+                for key, result in self._results.items()
+                if result.data is not None
+            },
+        }